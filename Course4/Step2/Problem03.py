@@ -1,53 +1,147 @@
+import argparse
+import glob
+import json
+import os
+import re
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import numpy as np
 from numpy.typing import NDArray
+from quantile_sketch import KLLSketch
 
+PARTS_DTYPE = [('code', 'i4'), ('strength', 'i4')]
+MEANS_DTYPE = [('code', 'i4'), ('strength', 'f8')]
+STRENGTH_QUANTILES = (0.05, 0.5, 0.95)
+RAW_DTYPE = [('parts', 'U64'), ('strength', 'i4')]
+# 마지막 수정 후 이 시간(초)이 지나지 않은 파일은 아직 쓰는 중으로 보고 미룬다
+SETTLE_SECONDS = 5.0
+# 부분 집계 워커가 한 번에 모아서 집계하는 최대 행 수
+PARTIAL_ROWS = 1 << 22
+
+
+def _parse_file(file) -> tuple[NDArray, NDArray, NDArray]:
+    """파일 하나를 (파일 내 코드, 강도, 정렬된 이름) 배열로 파싱한다
+
+    토큰 분리와 정수 변환은 np.loadtxt의 C 파서가, 코드 부여는 np.unique가
+    맡는다. 기존 load_data처럼 UTF-8로 읽으므로 한글 이름도 그대로 쓸 수 있다.
+    이름 앞뒤 공백은 고유한 이름에만 제거한다.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)  # 헤더만 있는 파일
+        rows = np.loadtxt(
+            file,
+            dtype=RAW_DTYPE,
+            delimiter=',',
+            skiprows=1,
+            encoding='utf-8',
+            ndmin=1,
+        )
+    if len(rows) == 0:
+        return np.empty(0, 'i4'), np.empty(0, 'i4'), np.empty(0, dtype=str)
+
+    # 가장 긴 이름 길이로 줄여서 정렬할 글자 수를 줄인다
+    width = max(int(np.char.str_len(rows['parts']).max()), 1)
+    raw_names, codes = np.unique(rows['parts'].astype(f'U{width}'), return_inverse=True)
+
+    # 공백만 다른 이름은 같은 part이므로 다시 한 번 합친다
+    names, merged = np.unique(np.char.strip(raw_names), return_inverse=True)
+
+    return merged.astype('i4')[codes], rows['strength'], names
 
-def load_data(files: tuple) -> NDArray | None:
-    try:
-        array_list = [
-            np.genfromtxt(
-                file,
-                dtype=[('parts', 'U64'), ('strength', 'i4')],
-                delimiter=',',
-                skip_header=1,
-                encoding='utf-8',
-                autostrip=True,
-            )
-            for file in files
-        ]
 
-        return np.concatenate(array_list)
-    except FileNotFoundError:
-        print(f'파일이 존재하지 않습니다: {files}')
+def encode_parts(names) -> tuple[NDArray, NDArray]:
+    """part 이름 배열을 (정렬된 이름 사전, int32 코드 배열)로 변환"""
+    dictionary, codes = np.unique(np.asarray(names), return_inverse=True)
+    return dictionary, codes.astype('i4')
+
+
+def load_data_fast(
+    files: tuple, workers: int | None = None
+) -> tuple[NDArray, NDArray] | None:
+    """여러 parts 파일을 프로세스 풀에서 병렬로 파싱해 하나의 배열에 채운다
+
+    파싱이 GIL을 잡지 않도록 파일마다 별도 프로세스에서 코드/강도 배열을 만들고,
+    결과 배열은 전체 행 수로 한 번만 할당해서 각 파일 구간에 복사한다. 워커가
+    결과 배열에 직접 쓰지는 않으므로, 워커가 돌려준 배열을 pickle로 받아 한 번
+    복사하는 비용은 np.concatenate를 쓸 때와 같다. part 이름은 정렬된 이름 사전과
+    그 사전을 가리키는 int32 코드로 저장된다.
+    """
+    workers = min(workers or os.cpu_count() or 1, max(len(files), 1))
+
+    try:
+        if workers == 1:
+            parsed = [_parse_file(file) for file in files]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = list(pool.map(_parse_file, files))
+    except FileNotFoundError as e:
+        print(f'파일이 존재하지 않습니다: {e.filename}')
+        return None
     except PermissionError:
         print('파일 읽기 권한이 없습니다.')
+        return None
     except Exception as e:
         print(f'파일을 읽는 과정에서 오류가 발생했습니다: {e}')
+        return None
+
+    return _combine(parsed)
 
 
-def calculate_means_per_parts(array: NDArray) -> NDArray:
-    unique_parts = np.unique(array['parts'])
-    strength_list = []
+def _combine(parsed: list) -> tuple[NDArray, NDArray]:
+    """파일별 (코드, 강도, 이름) 목록을 전체 이름 사전 기준의 배열 하나로 합친다"""
+    names = np.unique(np.concatenate([local for _, _, local in parsed] or [[]]))
+    offsets = np.concatenate(([0], np.cumsum([len(codes) for codes, _, _ in parsed])))
+    output = np.empty(int(offsets[-1]), dtype=PARTS_DTYPE)
 
-    for part in unique_parts:
-        strengths = array['strength'][array['parts'] == part]
-        strength_mean = np.mean(strengths)
-        print(f'{part}의 평균 강도: {strength_mean:.3f}')
-        strength_list.append((part, strength_mean))
+    # 파일별 코드를 전체 이름 사전 기준의 코드로 바꿔서 자기 구간에 기록한다
+    for i, (codes, strengths, local) in enumerate(parsed):
+        chunk = output[offsets[i] : offsets[i + 1]]
+        chunk['code'] = np.searchsorted(names, local).astype('i4')[codes]
+        chunk['strength'] = strengths
 
-    result_dtype = [('parts', 'U64'), ('strength', 'f8')]
+    return output, names.astype(str)
 
-    strength_mean_array = np.array(strength_list, dtype=result_dtype)
+
+def calculate_means_per_parts(
+    array: NDArray, names: NDArray, echo: bool = True
+) -> NDArray:
+    """part 코드별 평균 강도를 계산한다. echo가 참이면 결과를 출력한다"""
+    counts = np.bincount(array['code'], minlength=len(names))
+    sums = np.bincount(array['code'], weights=array['strength'], minlength=len(names))
+
+    present = np.flatnonzero(counts)
+    strength_mean_array = np.empty(len(present), dtype=MEANS_DTYPE)
+    strength_mean_array['code'] = present
+    strength_mean_array['strength'] = sums[present] / counts[present]
+
+    if echo:
+        for code, strength_mean in strength_mean_array:
+            print(f'{names[code]}의 평균 강도: {strength_mean:.3f}')
 
     return strength_mean_array
 
 
-def filter_value(array: NDArray, file_path: Path, upper_bound: float = 50.0):
+def decode_parts(array: NDArray, names: NDArray) -> NDArray:
+    """코드 배열을 출력용 (parts, strength) 배열로 되돌린다"""
+    decoded = np.empty(
+        len(array), dtype=[('parts', 'U64'), ('strength', array['strength'].dtype)]
+    )
+    decoded['parts'] = names[array['code']]
+    decoded['strength'] = array['strength']
+
+    return decoded
+
+
+def filter_value(
+    array: NDArray, names: NDArray, file_path: Path, upper_bound: float = 50.0
+):
     filter_mask = array['strength'] < upper_bound
 
-    output_array = array[filter_mask]
+    # 이름은 저장 직전에 필터링된 행에 대해서만 복원한다
+    output_array = decode_parts(array[filter_mask], names)
 
     if output_array.size == 0:
         print(f'strength가 {upper_bound}보다 작은 데이터가 없습니다.')
@@ -72,32 +166,332 @@ def filter_value(array: NDArray, file_path: Path, upper_bound: float = 50.0):
         print(f'파일을 저장하는 과정에서 오류가 발생했습니다: {e}')
 
 
+class PartsAggregate:
+    """part별 count/sum/Welford M2와 분위수 스케치를 누적하는 영속 집계 상태
+
+    새 파일만 한 번씩 합쳐 넣으므로 갱신 비용은 새로 들어온 행 수에 비례한다.
+    두 집계는 Chan의 병렬 분산 공식과 KLL 스케치 병합으로 합쳐진다.
+    """
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self._index: dict[str, int] = {}
+        self.count = np.zeros(0, dtype='i8')
+        self.total = np.zeros(0, dtype='f8')
+        self.m2 = np.zeros(0, dtype='f8')
+        self.sketches: list[KLLSketch] = []
+        self.files: dict[str, str] = {}
+
+    @classmethod
+    def from_array(cls, array: NDArray, names: NDArray) -> 'PartsAggregate':
+        """코드 배열 하나를 part별 부분 집계로 만든다"""
+        aggregate = cls()
+        size = len(names)
+        count = np.bincount(array['code'], minlength=size)
+        total = np.bincount(array['code'], weights=array['strength'], minlength=size)
+
+        present = np.flatnonzero(count)
+        deviation = array['strength'] - (total / np.maximum(count, 1))[array['code']]
+        m2 = np.bincount(array['code'], weights=deviation * deviation, minlength=size)
+
+        aggregate.names = [str(names[code]) for code in present]
+        aggregate._index = {name: i for i, name in enumerate(aggregate.names)}
+        aggregate.count = count[present].astype('i8')
+        aggregate.total = total[present]
+        aggregate.m2 = m2[present]
+
+        # 코드 순으로 한 번 정렬한 뒤 part별 구간을 스케치에 넣는다
+        order = np.argsort(array['code'], kind='stable')
+        bounds = np.concatenate(([0], np.cumsum(count)))
+        sorted_strength = array['strength'][order]
+        aggregate.sketches = [
+            KLLSketch().update(sorted_strength[bounds[code] : bounds[code + 1]])
+            for code in present
+        ]
+
+        return aggregate
+
+    def _indices_for(self, names: list[str]) -> NDArray:
+        """이름 목록에 해당하는 인덱스를 돌려주고, 처음 보는 part는 추가한다"""
+        for name in names:
+            if name not in self._index:
+                self._index[name] = len(self.names)
+                self.names.append(name)
+
+        grow = len(self.names) - len(self.count)
+        if grow:
+            self.count = np.concatenate((self.count, np.zeros(grow, dtype='i8')))
+            self.total = np.concatenate((self.total, np.zeros(grow)))
+            self.m2 = np.concatenate((self.m2, np.zeros(grow)))
+            self.sketches.extend(KLLSketch() for _ in range(grow))
+
+        return np.array([self._index[name] for name in names], dtype='i8')
+
+    def merge(self, other: 'PartsAggregate') -> 'PartsAggregate':
+        """다른 집계를 제자리에서 합친다 (결합 법칙 성립)"""
+        idx = self._indices_for(other.names)
+
+        n_a = self.count[idx]
+        n_b = other.count
+        n = n_a + n_b
+        mean_a = self.total[idx] / np.maximum(n_a, 1)
+        mean_b = other.total / np.maximum(n_b, 1)
+        delta = mean_b - mean_a
+
+        self.m2[idx] += other.m2 + delta * delta * n_a * n_b / np.maximum(n, 1)
+        self.count[idx] = n
+        self.total[idx] += other.total
+        for i, sketch in zip(idx, other.sketches):
+            self.sketches[i].merge(sketch)
+        self.files.update(other.files)
+
+        return self
+
+    @staticmethod
+    def fingerprint(file: Path) -> str:
+        stat = file.stat()
+        return f'{stat.st_size}:{stat.st_mtime_ns}'
+
+    def update_from_files(
+        self, files, workers: int | None = None, settle: float = SETTLE_SECONDS
+    ) -> int:
+        """반영하지 않은 파일만 병렬로 집계해서 합치고, 새로 반영한 파일 수를 반환
+
+        마지막 수정 후 settle초가 지나지 않은 파일은 아직 쓰는 중일 수 있으므로
+        기록하지 않고 미뤄서 다음 갱신 때 전체를 반영한다.
+        """
+        new_files = []
+        deferred = 0
+        now = time.time()
+        for file in files:
+            file = Path(file).resolve()
+            key = str(file)
+
+            if key in self.files:
+                if self.files[key] != self.fingerprint(file):
+                    print(f'이미 반영된 파일이 변경되어 건너뜁니다: {file}')
+                continue
+
+            if now - file.stat().st_mtime < settle:
+                deferred += 1
+                continue
+
+            new_files.append(file)
+
+        if deferred:
+            print(
+                f'아직 쓰는 중일 수 있는 파일 {deferred}개는 다음 갱신 때 반영합니다.'
+            )
+
+        if not new_files:
+            return 0
+
+        before = len(self.files)
+        self.merge(aggregate_files(new_files, workers=workers))
+
+        return len(self.files) - before
+
+    def means(self) -> NDArray:
+        return self.total / np.maximum(self.count, 1)
+
+    def variances(self, ddof: int = 0) -> NDArray:
+        return self.m2 / np.maximum(self.count - ddof, 1)
+
+    def quantiles(self, qs=STRENGTH_QUANTILES) -> NDArray:
+        """part별 근사 분위수, shape: (part 수, len(qs))"""
+        return np.array([sketch.quantiles(qs) for sketch in self.sketches]).reshape(
+            len(self.sketches), len(qs)
+        )
+
+    def to_means_array(self) -> tuple[NDArray, NDArray]:
+        """filter_value에 넘길 수 있는 (평균 배열, 이름 사전) 형태로 변환"""
+        means_array = np.empty(len(self.names), dtype=MEANS_DTYPE)
+        means_array['code'] = np.arange(len(self.names))
+        means_array['strength'] = self.means()
+
+        return means_array, np.array(self.names, dtype=str)
+
+    def save(self, path: Path):
+        state = {
+            'files': self.files,
+            'parts': {
+                name: [int(self.count[i]), float(self.total[i]), float(self.m2[i])]
+                for i, name in enumerate(self.names)
+            },
+            'sketches': {
+                name: self.sketches[i].to_dict() for i, name in enumerate(self.names)
+            },
+        }
+
+        # 저장 도중 중단되어도 기존 상태가 깨지지 않도록 임시 파일을 교체한다
+        tmp_path = Path(f'{path}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> 'PartsAggregate':
+        aggregate = cls()
+        if not Path(path).exists():
+            return aggregate
+
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+        aggregate.names = list(state['parts'])
+        aggregate._index = {name: i for i, name in enumerate(aggregate.names)}
+        values = np.array(list(state['parts'].values()), dtype='f8').reshape(-1, 3)
+        aggregate.count = values[:, 0].astype('i8')
+        aggregate.total = values[:, 1]
+        aggregate.m2 = values[:, 2]
+        sketches = state.get('sketches', {})
+        aggregate.sketches = [
+            KLLSketch.from_dict(sketches[name]) if name in sketches else KLLSketch()
+            for name in aggregate.names
+        ]
+        aggregate.files = state['files']
+
+        return aggregate
+
+
+def _partial_aggregate(files: list[Path]) -> PartsAggregate:
+    """프로세스 풀 작업 단위: 파일 묶음 하나의 part별 부분 집계
+
+    파일들을 PARTIAL_ROWS행까지 모아서 한 번에 집계하므로, 파일마다 부분 집계를
+    만들어 병합하는 비용이 워커 안에서도 대부분 사라진다. 읽지 못한 파일과 읽는
+    도중에 바뀐 파일은 기록하지 않고 건너뛰므로 다음 갱신 때 다시 읽힌다.
+    """
+    partial = PartsAggregate()
+    parsed: list = []
+    rows = 0
+
+    def fold():
+        if parsed:
+            partial.merge(PartsAggregate.from_array(*_combine(parsed)))
+            parsed.clear()
+
+    for file in files:
+        fingerprint = PartsAggregate.fingerprint(file)
+        loaded = load_data_fast((file,), workers=1)
+        if loaded is None:
+            continue
+        if PartsAggregate.fingerprint(file) != fingerprint:
+            print(f'읽는 도중에 변경된 파일은 다음 갱신 때 반영합니다: {file}')
+            continue
+
+        array, names = loaded
+        parsed.append((array['code'], array['strength'], names))
+        partial.files[str(file)] = fingerprint
+        rows += len(array)
+        if rows >= PARTIAL_ROWS:
+            fold()
+            rows = 0
+    fold()
+
+    return partial
+
+
+def aggregate_files(files: list, workers: int | None = None) -> PartsAggregate:
+    """파일을 워커 수만큼 묶어 묶음별 부분 집계를 계산하고 하나로 병합한다
+
+    워커마다 부분 집계 하나만 돌려주므로 부모 프로세스의 병합 비용은 파일 수가
+    아니라 워커 수에 비례한다. 부분 집계의 병합은 결합 법칙이 성립하므로 완료되는
+    순서와 상관없이 결과가 같다.
+    """
+    files = [Path(file).resolve() for file in files]
+    workers = min(workers or os.cpu_count() or 1, max(len(files), 1))
+    if workers == 1:
+        return _partial_aggregate(files)
+
+    # 크기가 비슷한 파일이 이름 순으로 몰려 있어도 고르게 나뉘도록 번갈아 배정한다
+    chunks = [files[i::workers] for i in range(workers)]
+    aggregate = PartsAggregate()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(_partial_aggregate, chunks):
+            aggregate.merge(partial)
+
+    return aggregate
+
+
+def discover_parts_files(
+    source, pattern: str = 'mars_base_main_parts-*.csv', include: str | None = None
+) -> list[Path]:
+    """디렉터리 또는 glob 패턴으로 parts 파일을 찾는다
+
+    include 정규식이 주어지면 파일 이름이 일치하는 파티션만 남긴다.
+    """
+    source = Path(source)
+
+    if source.is_dir():
+        files = source.rglob(pattern)
+    else:
+        files = map(Path, glob.iglob(str(source), recursive=True))
+
+    files = (file for file in files if file.is_file())
+    if include is not None:
+        include_re = re.compile(include)
+        files = (file for file in files if include_re.search(file.name))
+
+    return sorted(files)
+
+
 def main():
     BASE_DIR = Path(__file__).resolve().parent
-    files = (
-        BASE_DIR / 'mars_base/mars_base_main_parts-001.csv',
-        BASE_DIR / 'mars_base/mars_base_main_parts-002.csv',
-        BASE_DIR / 'mars_base/mars_base_main_parts-003.csv',
+
+    parser = argparse.ArgumentParser(description='part별 강도 집계')
+    parser.add_argument(
+        'source',
+        nargs='?',
+        default=BASE_DIR / 'mars_base',
+        help='parts 파일이 있는 디렉터리 또는 glob 패턴',
     )
+    parser.add_argument('--include', help='파일 이름으로 파티션을 고르는 정규식')
+    parser.add_argument('--workers', type=int, help='프로세스 수 (기본값: CPU 수)')
+    parser.add_argument(
+        '--settle',
+        type=float,
+        default=SETTLE_SECONDS,
+        help='이 시간(초) 안에 수정된 파일은 다음 실행 때 반영',
+    )
+    args = parser.parse_args()
 
-    output_file = BASE_DIR / 'parts_to_work_on.csv'
+    files = discover_parts_files(args.source, include=args.include)
 
-    # 데이터 불러오기
-    parts = load_data(files)
+    state_file = BASE_DIR / 'parts_state.json'
+    output_file = BASE_DIR / 'parts_to_work_on.csv'
 
-    if parts is None:
-        print('파일 처리 중에 오류가 발생했습니다.')
+    # 이전 집계 상태를 불러와 새로 도착한 파일만 반영
+    try:
+        aggregate = PartsAggregate.load(state_file)
+        added = aggregate.update_from_files(
+            files, workers=args.workers, settle=args.settle
+        )
+    except (OSError, ValueError, KeyError) as e:
+        print(f'집계 상태를 갱신하는 과정에서 오류가 발생했습니다: {e}')
         return
 
-    if parts.size == 0:
+    print(f'새로 반영한 파일: {added}개 (누적 {len(aggregate.files)}개)')
+
+    if not aggregate.names:
         print('데이터가 없습니다.')
         return
 
-    # part별 강도 평균 구하기
-    parts_mean_array = calculate_means_per_parts(parts)
+    if added:
+        aggregate.save(state_file)
+
+    # part별 강도 평균/분산/분위수 출력
+    variances = aggregate.variances()
+    quantiles = aggregate.quantiles(STRENGTH_QUANTILES)
+    for i, (name, mean) in enumerate(zip(aggregate.names, aggregate.means())):
+        p5, p50, p95 = quantiles[i]
+        print(
+            f'{name}의 평균 강도: {mean:.3f}, 분산: {variances[i]:.3f}, '
+            f'p5/p50/p95: {p5:.1f}/{p50:.1f}/{p95:.1f}'
+        )
 
     # 평균 강도가 50보다 작은 part만 분류해서 저장
-    filter_value(parts_mean_array, output_file, 50)
+    parts_mean_array, names = aggregate.to_means_array()
+    filter_value(parts_mean_array, names, output_file, 50)
 
 
 if __name__ == '__main__':
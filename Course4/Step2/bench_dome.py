@@ -0,0 +1,37 @@
+import time
+
+import numpy as np
+from design_dome import MATERIALS, dome_batch, sphere_area
+
+
+def benchmark_dome_batch(n_designs: int = 10_000_000, n_scalar: int = 100_000):
+    """스칼라 sphere_area 반복 호출과 벡터화된 dome_batch 처리량 비교"""
+    rng = np.random.default_rng(0)
+    diameters = rng.uniform(1, 20, n_designs)
+    thicknesses = rng.uniform(0.5, 10, n_designs)
+    material_codes = rng.integers(0, len(MATERIALS), n_designs)
+
+    start = time.perf_counter()
+    for i in range(n_scalar):
+        sphere_area(
+            diameters[i], MATERIALS[material_codes[i]], thickness=thicknesses[i]
+        )
+    scalar_rate = n_scalar / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    area, mass, weight_on_mars = dome_batch(diameters, thicknesses, material_codes)
+    batch_elapsed = time.perf_counter() - start
+    batch_rate = n_designs / batch_elapsed
+
+    print('########## 돔 계산 벤치마크 ##########')
+    print(f'스칼라 sphere_area: {scalar_rate:,.0f} designs/s ({n_scalar:,}개 기준)')
+    print(
+        f'벡터화 dome_batch: {n_designs:,}개 {batch_elapsed:.3f}초, '
+        f'{batch_rate:,.0f} designs/s ({batch_rate / scalar_rate:.0f}배)'
+    )
+    result_bytes = area.nbytes + mass.nbytes + weight_on_mars.nbytes
+    print(f'결과 배열 메모리: {result_bytes / 2**20:,.0f} MiB')
+
+
+if __name__ == '__main__':
+    benchmark_dome_batch()
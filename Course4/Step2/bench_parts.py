@@ -0,0 +1,140 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+from Problem03 import (
+    aggregate_files,
+    calculate_means_per_parts,
+    discover_parts_files,
+    encode_parts,
+)
+from quantile_sketch import KLLSketch
+
+
+def _make_parts(n_rows: int, n_parts: int, seed: int = 0) -> NDArray:
+    rng = np.random.default_rng(seed)
+    array = np.empty(n_rows, dtype=[('parts', 'U64'), ('strength', 'i4')])
+    array['parts'] = np.char.add('Part-', rng.integers(0, n_parts, n_rows).astype(str))
+    array['strength'] = rng.integers(0, 100, n_rows)
+
+    return array
+
+
+def _means_unicode(array: NDArray) -> NDArray:
+    """U64 비교를 사용하던 기존 방식의 part별 평균"""
+    unique_parts = np.unique(array['parts'])
+    return np.array(
+        [array['strength'][array['parts'] == part].mean() for part in unique_parts]
+    )
+
+
+def compare_encoding(n_rows: int = 1_000_000, n_parts: int = 50):
+    """U64 문자열 컬럼과 사전 인코딩(int32 코드) 컬럼의 메모리/속도 비교"""
+    unicode_array = _make_parts(n_rows, n_parts)
+
+    names, codes = encode_parts(unicode_array['parts'])
+    encoded_array = np.empty(n_rows, dtype=[('code', 'i4'), ('strength', 'i4')])
+    encoded_array['code'] = codes
+    encoded_array['strength'] = unicode_array['strength']
+
+    start = time.perf_counter()
+    expected = _means_unicode(unicode_array)
+    unicode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    means = calculate_means_per_parts(encoded_array, names, echo=False)
+    encoded_time = time.perf_counter() - start
+
+    assert np.allclose(expected, means['strength'])
+
+    encoded_bytes = encoded_array.nbytes + names.nbytes
+    print('########## 사전 인코딩 비교 ##########')
+    print(f'행 수: {n_rows:,}, part 수: {n_parts}')
+    print(f'U64 메모리: {unicode_array.nbytes / 2**20:,.1f} MiB')
+    print(f'코드 메모리: {encoded_bytes / 2**20:,.1f} MiB')
+    print(f'U64 평균 계산: {unicode_time:.3f}초')
+    print(f'코드 평균 계산: {encoded_time:.3f}초 ({unicode_time / encoded_time:.1f}배)')
+
+
+def _write_parts_files(directory: Path, n_files: int, rows_per_file: int):
+    rng = np.random.default_rng(0)
+    for i in range(n_files):
+        codes = rng.integers(0, 50, rows_per_file)
+        strengths = rng.integers(0, 100, rows_per_file)
+        lines = [f'Part-{c},{s}' for c, s in zip(codes, strengths)]
+        with open(
+            directory / f'mars_base_main_parts-{i:05d}.csv', 'w', encoding='utf-8'
+        ) as f:
+            f.write('parts,strength\n' + '\n'.join(lines) + '\n')
+
+
+def benchmark_parallel(n_files: int = 1000, rows_per_file: int = 2000):
+    """파일 수가 많은 디렉터리에서 프로세스 수에 따른 집계 처리량 측정"""
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        _write_parts_files(directory, n_files, rows_per_file)
+        files = discover_parts_files(directory)
+
+        print('########## 병렬 부분 집계 ##########')
+        print(f'파일 수: {len(files):,}, 파일당 행 수: {rows_per_file:,}')
+
+        cpu_count = os.cpu_count() or 1
+        workers_list = sorted({1, 2, 4, cpu_count} & set(range(1, cpu_count + 1)))
+        for workers in workers_list:
+            start = time.perf_counter()
+            aggregate = aggregate_files(files, workers=workers)
+            elapsed = time.perf_counter() - start
+            rows = int(aggregate.count.sum())
+            print(
+                f'프로세스 {workers}개: {elapsed:.2f}초, '
+                f'{len(files) / elapsed:,.0f} files/s, {rows / elapsed:,.0f} rows/s'
+            )
+
+
+def check_sketch_accuracy(
+    n_samples: int = 1_000_000, n_workers: int = 8, tolerance: float = 0.01
+):
+    """KLL 스케치 분위수를 NumPy 정확한 분위수와 순위 오차로 비교한다
+
+    여러 작업자가 나눠 만든 스케치를 병합한 결과도 같은 허용 오차를 만족해야 한다.
+    """
+    rng = np.random.default_rng(42)
+    samples = {
+        'normal': rng.normal(50, 15, n_samples),
+        'uniform': rng.integers(0, 100, n_samples).astype('f8'),
+        'skewed': rng.exponential(10, n_samples),
+    }
+    qs = np.array([0.05, 0.5, 0.95])
+
+    print('########## 분위수 스케치 정확도 ##########')
+    for label, values in samples.items():
+        single = KLLSketch(seed=0).update(values)
+
+        merged = KLLSketch(seed=0)
+        for i, chunk in enumerate(np.array_split(values, n_workers)):
+            merged.merge(KLLSketch(seed=i).update(chunk))
+
+        exact = np.quantile(values, qs)
+        sorted_values = np.sort(values)
+        for name, sketch in (('단일', single), ('병합', merged)):
+            estimate = sketch.quantiles(qs)
+            # 값 중복이 있는 분포도 고려해 추정값이 차지하는 순위 구간과 비교한다
+            low = np.searchsorted(sorted_values, estimate, side='left') / n_samples
+            high = np.searchsorted(sorted_values, estimate, side='right') / n_samples
+            rank_error = np.maximum(np.maximum(low - qs, qs - high), 0)
+
+            print(
+                f'{label}/{name}: 추정 {np.round(estimate, 2)}, '
+                f'정확 {np.round(exact, 2)}, 최대 순위 오차 {rank_error.max():.4f}, '
+                f'보관 값 {sketch.size}개'
+            )
+            assert rank_error.max() <= tolerance, f'{label}/{name} 순위 오차 초과'
+
+
+if __name__ == '__main__':
+    check_sketch_accuracy()
+    compare_encoding()
+    benchmark_parallel()
@@ -1,5 +1,14 @@
+import argparse
+import contextlib
+import csv
+import json
 import math
 import sys
+from typing import Iterator
+
+import numpy as np
+from material_registry import load_registry
+from numpy.typing import NDArray
 
 # 전역변수 선언
 MATERIAL: str = ''
@@ -7,34 +16,63 @@ DIAMETER: float = 0.0
 THICKNESS: float = 0.0
 AREA: float = 0.0
 WEIGHT_ON_MARS: float = 0.0
-GRAVITY_ON_MARS = 0.38
 
-kor2eng = {'유리': 'glass', '알루미늄': 'aluminum', '탄소강': 'carbon_steel'}
-eng2kor = {'glass': '유리', 'aluminum': '알루미늄', 'carbon_steel': '탄소강'}
+# 재질/중력 정보는 materials.json에서 한 번만 읽는다
+REGISTRY = load_registry()
+GRAVITY_ON_MARS = REGISTRY.gravity('mars')
 
+# 재질 코드 = MATERIALS의 인덱스
+MATERIALS = REGISTRY.names
+MATERIAL_CODES = REGISTRY.codes
+kor2eng = dict(zip(REGISTRY.kor_names, REGISTRY.names))
+eng2kor = dict(zip(REGISTRY.names, REGISTRY.kor_names))
+BATCH_CHUNK_SIZE = 65536
 
-def sphere_area(diameter: float, material: str, thickness: float = 1.0):
-    global MATERIAL, DIAMETER, THICKNESS, AREA, WEIGHT_ON_MARS, GRAVITY_ON_MARS
 
-    density_dict = {'glass': 2400, 'aluminum': 2700, 'carbon_steel': 7850}
-    outer_radius = diameter / 2  # 단위: m
-    thickness_in_m = thickness / 100  # 단위 m
-    inner_radius = outer_radius - thickness_in_m
+def dome_batch(
+    diameters,
+    thicknesses,
+    material_codes,
+    gravity: float = GRAVITY_ON_MARS,
+    temperature=None,
+) -> tuple[NDArray, NDArray, NDArray]:
+    """여러 돔의 면적, 질량, 화성 무게를 한 번에 계산한다
 
-    density = density_dict.get(material, 0)
+    전역 상태를 건드리지 않는 순수 함수이며, 입력은 같은 shape로
+    브로드캐스팅되는 배열(지름 m, 두께 cm, 재질 코드)이다.
+    temperature(℃)를 주면 재질 밀도를 온도에 맞춰 보정하고, gravity로 다른
+    행성의 중력 비율을 쓸 수 있다.
+    반환값은 (면적 ㎡, 질량 kg, 무게) 배열이다.
+    """
+    outer_radius = np.asarray(diameters, dtype='f8') / 2  # 단위: m
+    inner_radius = outer_radius - np.asarray(thicknesses, dtype='f8') / 100
+    density = REGISTRY.densities_at(material_codes, temperature)
 
-    area = 2 * math.pi * (outer_radius * outer_radius)
-    outer_volume = (2 / 3) * math.pi * (outer_radius**3)
-    inner_volume = (2 / 3) * math.pi * (inner_radius**3)
-    volume = outer_volume - inner_volume
+    area = 2 * np.pi * outer_radius * outer_radius
+    volume = (2 / 3) * np.pi * (outer_radius**3 - inner_radius**3)
     mass = volume * density
-    weight_on_mars = mass * GRAVITY_ON_MARS
+    weight_on_mars = mass * gravity
+
+    return area, mass, weight_on_mars
+
+
+def sphere_area(diameter: float, material: str, thickness: float = 1.0):
+    global MATERIAL, DIAMETER, THICKNESS, AREA, WEIGHT_ON_MARS
+
+    if material in MATERIAL_CODES:
+        area, _, weight_on_mars = dome_batch(
+            diameter, thickness, MATERIAL_CODES[material]
+        )
+    else:
+        # 알 수 없는 재질은 밀도 0으로 계산하던 기존 동작 유지
+        area = 2 * math.pi * (diameter / 2) ** 2
+        weight_on_mars = 0.0
 
     MATERIAL = eng2kor.get(material, '')
     DIAMETER = diameter
     THICKNESS = thickness
-    AREA = area
-    WEIGHT_ON_MARS = weight_on_mars
+    AREA = float(area)
+    WEIGHT_ON_MARS = float(weight_on_mars)
 
 
 def _read_or_quit(prompt: str, is_material: bool = False) -> str:
@@ -53,37 +91,215 @@ def _read_or_quit(prompt: str, is_material: bool = False) -> str:
 
 
 def _check_material_ok(material_in: str) -> str:
-    kor2eng = {'유리': 'glass', '알루미늄': 'aluminum', '탄소강': 'carbon_steel'}
-    allowed = {'glass', 'aluminum', 'carbon_steel'}
+    try:
+        return MATERIALS[REGISTRY.code(material_in)]
+    except ValueError:
+        allowed = ', '.join(f'{eng2kor[name]}/{name}' for name in MATERIALS)
+        raise ValueError(f'재질은 {allowed} 중 하나여야 합니다.') from None
+
+
+def _check_diameter_ok(diameter: float) -> float:
+    if not math.isfinite(diameter) or diameter <= 0:
+        raise ValueError('지름은 0보다 커야 합니다.')
+    return diameter
+
+
+def _check_thickness_ok(thickness: float, diameter: float) -> float:
+    if not math.isfinite(thickness) or thickness <= 0:
+        raise ValueError('두께는 0보다 커야 합니다.')
+    if thickness >= (diameter / 2) * 100:
+        raise ValueError('두께는 반지름보다 크거나 같을 수 없습니다.')
+    return thickness
 
-    s = material_in.strip().lower()
-    s = kor2eng.get(s, s)
 
-    if s not in allowed:
-        raise ValueError(
-            '재질은 유리/glass, 알루미늄/aluminum, 탄소강/carbon_steel 중 하나여야 합니다.'
+def _check_spec_ok(spec: dict) -> tuple[float, str, float]:
+    """배치 입력 한 행을 대화형 입력과 같은 규칙으로 검증한다"""
+    thickness = spec.get('thickness')
+    diameter = _check_diameter_ok(float(spec['diameter']))
+    material = _check_material_ok(str(spec['material']))
+    thickness = _check_thickness_ok(
+        1.0 if thickness in (None, '') else float(thickness), diameter
+    )
+
+    return diameter, material, thickness
+
+
+def _iter_specs(f, fmt: str) -> Iterator[tuple[int, str, dict | None]]:
+    """(행 번호, 원본 행, 파싱된 dict) 순으로 돌려준다. 파싱 실패 시 dict는 None"""
+    if fmt == 'csv':
+        header = next(f, '')
+        fields = [name.strip() for name in next(csv.reader([header]), [])]
+        for line_no, line in enumerate(f, start=2):
+            if not line.strip():
+                continue
+            values = next(csv.reader([line]))
+            if len(values) > len(fields):
+                yield line_no, line, None
+                continue
+            yield line_no, line, dict(zip(fields, values))
+    else:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            yield line_no, line, record if isinstance(record, dict) else None
+
+
+def _flush_chunk(
+    writer,
+    diameters: list,
+    materials: list,
+    thicknesses: list,
+    gravity: float = GRAVITY_ON_MARS,
+    temperature: float | None = None,
+):
+    codes = [MATERIAL_CODES[material] for material in materials]
+    area, _, weight_on_mars = dome_batch(
+        diameters, thicknesses, codes, gravity=gravity, temperature=temperature
+    )
+
+    writer.writerows(
+        zip(
+            materials,
+            diameters,
+            thicknesses,
+            np.round(area, 3).tolist(),
+            np.round(weight_on_mars, 3).tolist(),
         )
-    return s
+    )
+
+
+def run_batch(
+    input_file,
+    output_file,
+    reject_file,
+    fmt: str = 'csv',
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    planet: str = 'mars',
+    temperature: float | None = None,
+) -> tuple[int, int]:
+    """돔 설계 명세를 스트리밍으로 읽어 청크 단위로 계산하고 결과를 바로 쓴다
+
+    메모리 사용량은 chunk_size에만 비례한다. 검증에 실패한 행은 사유와 함께
+    reject_file에 NDJSON으로 기록하고 계속 진행한다. (처리 행 수, 거부 행 수)를
+    반환한다.
+    """
+    gravity = REGISTRY.gravity(planet)
+    writer = csv.writer(output_file)
+    writer.writerow(
+        ['material', 'diameter', 'thickness', 'area', f'weight_on_{planet.lower()}']
+    )
+
+    diameters: list[float] = []
+    materials: list[str] = []
+    thicknesses: list[float] = []
+    accepted = rejected = 0
+
+    for line_no, line, spec in _iter_specs(input_file, fmt):
+        try:
+            if spec is None:
+                raise ValueError('행을 해석할 수 없습니다.')
+            diameter, material, thickness = _check_spec_ok(spec)
+        except (ValueError, KeyError, TypeError) as e:
+            reason = f'필수 항목 누락: {e}' if isinstance(e, KeyError) else str(e)
+            reject_file.write(
+                json.dumps(
+                    {'line': line_no, 'input': line.rstrip('\n'), 'error': reason},
+                    ensure_ascii=False,
+                )
+                + '\n'
+            )
+            rejected += 1
+            continue
+
+        diameters.append(diameter)
+        materials.append(material)
+        thicknesses.append(thickness)
+
+        if len(diameters) >= chunk_size:
+            _flush_chunk(
+                writer, diameters, materials, thicknesses, gravity, temperature
+            )
+            accepted += len(diameters)
+            diameters, materials, thicknesses = [], [], []
+
+    if diameters:
+        _flush_chunk(writer, diameters, materials, thicknesses, gravity, temperature)
+        accepted += len(diameters)
+
+    return accepted, rejected
+
+
+def _open_or_std(path: str, mode: str, std):
+    if path == '-':
+        return contextlib.nullcontext(std)
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def batch_main(args):
+    fmt = args.format
+    if fmt is None:
+        fmt = 'ndjson' if args.batch.endswith(('.ndjson', '.jsonl')) else 'csv'
+
+    try:
+        with (
+            _open_or_std(args.batch, 'r', sys.stdin) as input_file,
+            _open_or_std(args.output, 'w', sys.stdout) as output_file,
+            open(args.rejects, 'w', encoding='utf-8') as reject_file,
+        ):
+            accepted, rejected = run_batch(
+                input_file,
+                output_file,
+                reject_file,
+                fmt,
+                planet=args.planet,
+                temperature=args.temperature,
+            )
+    except ValueError as e:
+        print(f'입력에 오류가 발생했습니다.\n오류 메시지: {e}', file=sys.stderr)
+        return
+    except FileNotFoundError as e:
+        print(f'파일이 존재하지 않습니다: {e.filename}', file=sys.stderr)
+        return
+    except PermissionError:
+        print('파일 접근 권한이 없습니다.', file=sys.stderr)
+        return
+
+    print(f'처리 {accepted:,}건, 거부 {rejected:,}건 ({args.rejects})', file=sys.stderr)
 
 
 def main():
+    parser = argparse.ArgumentParser(description='화성 돔 면적/무게 계산')
+    parser.add_argument('--batch', metavar='INPUT', help='명세 파일 경로 (- 는 stdin)')
+    parser.add_argument('--output', default='-', help='결과 CSV 경로 (기본값: stdout)')
+    parser.add_argument(
+        '--rejects', default='dome_rejects.ndjson', help='거부된 행을 기록할 파일'
+    )
+    parser.add_argument('--format', choices=('csv', 'ndjson'), help='입력 형식')
+    parser.add_argument('--planet', default='mars', help='무게를 계산할 행성')
+    parser.add_argument('--temperature', type=float, help='밀도 보정 온도(℃)')
+    args = parser.parse_args()
+
+    if args.batch is not None:
+        batch_main(args)
+        return
+
     while True:
         try:
-            diameter = float(_read_or_quit('지름을 입력하세요(단위: m): '))
-            if diameter <= 0:
-                raise ValueError('지름은 0보다 커야 합니다.')
+            diameter = _check_diameter_ok(
+                float(_read_or_quit('지름을 입력하세요(단위: m): '))
+            )
             material = _read_or_quit('재질을 입력하세요: ', is_material=True)
             thickness_str = _read_or_quit('두께를 입력하세요(기본값: 1cm, 단위: cm): ')
 
-            thickness = 1.0 if thickness_str == '' else float(thickness_str)
-
-            if thickness <= 0:
-                raise ValueError('두께는 0보다 커야 합니다.')
-            if thickness >= (diameter / 2) * 100:
-                raise ValueError('두께는 반지름보다 크거나 같을 수 없습니다.')
+            thickness = _check_thickness_ok(
+                1.0 if thickness_str == '' else float(thickness_str), diameter
+            )
 
             sphere_area(diameter=diameter, material=material, thickness=thickness)
-
             print('########## 계산 결과 ##########')
             print(
                 f'재질 ⇒ {MATERIAL}, '
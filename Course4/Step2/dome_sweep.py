@@ -0,0 +1,232 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+import numpy as np
+from design_dome import MATERIALS, dome_batch, eng2kor
+from numpy.typing import NDArray
+
+DESIGN_DTYPE = [
+    ('diameter', 'f8'),
+    ('thickness', 'f8'),
+    ('material', 'i4'),
+    ('area', 'f8'),
+    ('weight', 'f8'),
+]
+CHUNK_SIZE = 1 << 20
+
+
+def pareto_front(designs: NDArray) -> NDArray:
+    """면적은 클수록, 화성 무게는 작을수록 좋은 파레토 최적 설계만 남긴다"""
+    if designs.size == 0:
+        return designs
+
+    # 무게 오름차순(같으면 면적 내림차순)으로 정렬한 뒤, 앞선 설계보다 면적이
+    # 더 넓은 설계만 지배당하지 않는다
+    order = np.lexsort((-designs['area'], designs['weight']))
+    designs = designs[order]
+    best_area_before = np.maximum.accumulate(
+        np.concatenate(([-np.inf], designs['area'][:-1]))
+    )
+
+    return designs[designs['area'] > best_area_before]
+
+
+def _evaluate(
+    diameters: NDArray,
+    thicknesses: NDArray,
+    material_codes: NDArray,
+    area_target: float,
+    weight_limit: float,
+) -> NDArray:
+    """조건을 만족하는 설계만 구조화 배열로 반환"""
+    area, _, weight_on_mars = dome_batch(diameters, thicknesses, material_codes)
+
+    feasible = (
+        (thicknesses < diameters / 2 * 100)
+        & (area >= area_target)
+        & (weight_on_mars <= weight_limit)
+    )
+
+    designs = np.empty(int(feasible.sum()), dtype=DESIGN_DTYPE)
+    designs['diameter'] = diameters[feasible]
+    designs['thickness'] = thicknesses[feasible]
+    designs['material'] = material_codes[feasible]
+    designs['area'] = area[feasible]
+    designs['weight'] = weight_on_mars[feasible]
+
+    return designs
+
+
+def _evaluate_chunk(args) -> NDArray:
+    """프로세스 풀 작업 단위: 평탄화된 격자의 [start, stop) 구간을 평가"""
+    diameters, thicknesses, n_materials, start, stop, area_target, weight_limit = args
+
+    flat = np.arange(start, stop)
+    d_idx, t_idx, m_idx = np.unravel_index(
+        flat, (len(diameters), len(thicknesses), n_materials)
+    )
+    designs = _evaluate(
+        diameters[d_idx],
+        thicknesses[t_idx],
+        m_idx.astype('i4'),
+        area_target,
+        weight_limit,
+    )
+
+    # 청크 안에서 파레토 최적만 돌려보내 전송량을 줄인다
+    return pareto_front(designs)
+
+
+def sweep(
+    diameters,
+    thicknesses,
+    area_target: float,
+    weight_limit: float,
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[NDArray]:
+    """지름 x 두께 x 재질 격자를 청크 단위로 병렬 평가한다
+
+    청크별 파레토 집합을 순서대로 흘려보내며, 전체 격자를 메모리에 만들지 않고
+    각 청크는 작업자 안에서만 펼쳐진다.
+    """
+    diameters = np.asarray(diameters, dtype='f8')
+    thicknesses = np.asarray(thicknesses, dtype='f8')
+    n_materials = len(MATERIALS)
+    total = len(diameters) * len(thicknesses) * n_materials
+
+    tasks = (
+        (
+            diameters,
+            thicknesses,
+            n_materials,
+            start,
+            min(start + chunk_size, total),
+            area_target,
+            weight_limit,
+        )
+        for start in range(0, total, chunk_size)
+    )
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        yield from pool.map(_evaluate_chunk, tasks)
+
+
+def _refine(
+    best: np.void,
+    diameters: NDArray,
+    thicknesses: NDArray,
+    area_target: float,
+    weight_limit: float,
+    points: int = 41,
+) -> NDArray:
+    """가장 가벼운 설계 주변 한 칸 범위를 탐색 구간 안에서 촘촘하게 다시 평가한다"""
+    d_step = np.diff(diameters).max(initial=0.0)
+    t_step = np.diff(thicknesses).max(initial=0.0)
+
+    diameters = np.linspace(
+        max(best['diameter'] - d_step, diameters[0]),
+        min(best['diameter'] + d_step, diameters[-1]),
+        points,
+    )
+    thicknesses = np.linspace(
+        max(best['thickness'] - t_step, thicknesses[0]),
+        min(best['thickness'] + t_step, thicknesses[-1]),
+        points,
+    )
+    d_grid, t_grid = np.meshgrid(diameters, thicknesses, indexing='ij')
+
+    return _evaluate(
+        d_grid.ravel(),
+        t_grid.ravel(),
+        np.full(d_grid.size, best['material'], dtype='i4'),
+        area_target,
+        weight_limit,
+    )
+
+
+def optimize_dome(
+    diameters,
+    thicknesses,
+    area_target: float,
+    weight_limit: float,
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> tuple[np.void | None, NDArray]:
+    """조건을 만족하는 가장 가벼운 돔과 (면적, 화성 무게) 파레토 집합을 찾는다"""
+    diameters = np.asarray(diameters, dtype='f8')
+    thicknesses = np.asarray(thicknesses, dtype='f8')
+
+    front = np.empty(0, dtype=DESIGN_DTYPE)
+    for chunk_front in sweep(
+        diameters, thicknesses, area_target, weight_limit, workers, chunk_size
+    ):
+        front = pareto_front(np.concatenate((front, chunk_front)))
+
+    if front.size == 0:
+        return None, front
+
+    # 재질별로 가장 가벼운 설계를 격자 간격 한 칸 범위에서 다듬는다
+    sorted_diameters = np.unique(diameters)
+    sorted_thicknesses = np.unique(thicknesses)
+    for material in np.unique(front['material']):
+        candidates = front[front['material'] == material]
+        lightest = candidates[np.argmin(candidates['weight'])]
+        refined = _refine(
+            lightest, sorted_diameters, sorted_thicknesses, area_target, weight_limit
+        )
+        front = pareto_front(np.concatenate((front, refined)))
+
+    best = front[np.argmin(front['weight'])]
+
+    return best, front
+
+
+def main():
+    parser = argparse.ArgumentParser(description='돔 설계 공간 탐색')
+    parser.add_argument(
+        '--area-target', type=float, required=True, help='최소 면적(㎡)'
+    )
+    parser.add_argument(
+        '--weight-limit', type=float, required=True, help='최대 화성 무게(kg)'
+    )
+    parser.add_argument('--diameter', type=float, nargs=3, default=(1, 30, 2000))
+    parser.add_argument('--thickness', type=float, nargs=3, default=(0.1, 10, 500))
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    d_start, d_stop, d_num = args.diameter
+    t_start, t_stop, t_num = args.thickness
+    best, front = optimize_dome(
+        np.linspace(d_start, d_stop, int(d_num)),
+        np.linspace(t_start, t_stop, int(t_num)),
+        args.area_target,
+        args.weight_limit,
+        workers=args.workers,
+    )
+
+    if best is None:
+        print('조건을 만족하는 설계가 없습니다.')
+        return
+
+    print('########## 가장 가벼운 설계 ##########')
+    print(
+        f'재질 ⇒ {eng2kor[MATERIALS[best["material"]]]}, '
+        f'지름 ⇒ {best["diameter"]:.3f}, '
+        f'두께 ⇒ {best["thickness"]:.3f}, '
+        f'면적 ⇒ {best["area"]:.3f} ㎡, '
+        f'무게 ⇒ {best["weight"]:.3f} kg'
+    )
+
+    print(f'\n########## 파레토 최적 설계 ({front.size}개) ##########')
+    for design in front:
+        print(
+            f'{MATERIALS[design["material"]]}, {design["diameter"]:.3f}, '
+            f'{design["thickness"]:.3f}, {design["area"]:.3f}, {design["weight"]:.3f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
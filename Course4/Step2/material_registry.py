@@ -0,0 +1,71 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+DEFAULT_REGISTRY_FILE = Path(__file__).resolve().parent / 'materials.json'
+
+
+class MaterialRegistry:
+    """재질 물성과 행성별 중력을 코드(인덱스) 기반 배열로 보관하는 레지스트리
+
+    재질 코드는 names의 인덱스이며, densities 같은 배열에 코드 배열을 그대로
+    인덱싱해서 벡터 연산에 사용할 수 있다.
+    """
+
+    def __init__(self, data: dict) -> None:
+        materials = data['materials']
+
+        self.reference_temperature = float(data.get('reference_temperature', 20.0))
+        self.names: tuple[str, ...] = tuple(m['code'] for m in materials)
+        self.kor_names: tuple[str, ...] = tuple(m['kor'] for m in materials)
+        self.densities: NDArray = np.array(
+            [m['density'] for m in materials], dtype='f8'
+        )  # 단위: kg/m³ (기준 온도)
+        self.expansions: NDArray = np.array(
+            [m.get('thermal_expansion', 0.0) for m in materials], dtype='f8'
+        )  # 선팽창 계수, 단위: 1/K
+        self.gravity_ratios: dict[str, float] = {
+            planet.lower(): float(ratio) for planet, ratio in data['gravity'].items()
+        }  # 지구 대비 중력 비율
+
+        self.codes: dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        # 영문/한글 이름 모두로 조회할 수 있도록 별칭을 만든다
+        self._aliases: dict[str, int] = {
+            **self.codes,
+            **{name: i for i, name in enumerate(self.kor_names)},
+        }
+
+    def code(self, name: str) -> int:
+        try:
+            return self._aliases[name.strip().lower()]
+        except KeyError:
+            raise ValueError(f'등록되지 않은 재질입니다: {name}') from None
+
+    def densities_at(self, codes, temperature=None) -> NDArray:
+        """재질 코드 배열의 밀도를 온도(℃)에 맞춰 보정해서 반환
+
+        부피 팽창은 선팽창 계수의 3배로 근사한다.
+        """
+        codes = np.asarray(codes, dtype='i8')
+        densities = self.densities[codes]
+        if temperature is None:
+            return densities
+
+        delta = np.asarray(temperature, dtype='f8') - self.reference_temperature
+        return densities / (1 + 3 * self.expansions[codes] * delta)
+
+    def gravity(self, planet: str) -> float:
+        try:
+            return self.gravity_ratios[planet.strip().lower()]
+        except KeyError:
+            raise ValueError(f'등록되지 않은 행성입니다: {planet}') from None
+
+
+@lru_cache(maxsize=None)
+def load_registry(path: Path = DEFAULT_REGISTRY_FILE) -> MaterialRegistry:
+    """레지스트리 파일을 한 번만 읽어서 캐시한다"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return MaterialRegistry(json.load(f))
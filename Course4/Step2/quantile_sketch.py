@@ -0,0 +1,111 @@
+import numpy as np
+from numpy.typing import NDArray
+
+
+class KLLSketch:
+    """병합 가능한 KLL 분위수 스케치
+
+    레벨 h에 있는 값은 원본 값 2**h개를 대표한다. 레벨 용량은 위에서부터 c배씩
+    줄어들기 때문에 보관하는 값의 수는 입력 크기와 상관없이 약 k / (1 - c)개로
+    제한되고, 순위 오차는 대략 O(1 / k)이다.
+    """
+
+    def __init__(self, k: int = 200, c: float = 2 / 3, seed: int | None = None):
+        self.k = k
+        self.c = c
+        self.n = 0
+        self.levels: list[NDArray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, height: int) -> int:
+        depth = len(self.levels) - height - 1
+        return max(2, int(np.ceil(self.k * self.c**depth)))
+
+    def _compress(self):
+        height = 0
+        while height < len(self.levels):
+            level = self.levels[height]
+            if len(level) <= self._capacity(height):
+                height += 1
+                continue
+
+            if height + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+
+            # 짝수 개만 압축하고, 홀수일 때 남는 값 하나는 현재 레벨에 둔다
+            level = np.sort(level)
+            keep = level[len(level) - len(level) % 2 :]
+            paired = level[: len(level) - len(keep)]
+            offset = int(self._rng.integers(2))
+
+            self.levels[height] = keep
+            self.levels[height + 1] = np.concatenate(
+                (self.levels[height + 1], paired[offset::2])
+            )
+            # 레벨이 늘어나면 아래 레벨 용량이 줄어들므로 처음부터 다시 확인한다
+            height = 0
+
+    def update(self, values) -> 'KLLSketch':
+        values = np.asarray(values, dtype='f8').ravel()
+        if values.size == 0:
+            return self
+
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self.n += values.size
+        self._compress()
+
+        return self
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """다른 스케치를 제자리에서 합친다"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+
+        for height, level in enumerate(other.levels):
+            self.levels[height] = np.concatenate((self.levels[height], level))
+
+        self.n += other.n
+        self._compress()
+
+        return self
+
+    def quantiles(self, qs) -> NDArray:
+        qs = np.asarray(qs, dtype='f8')
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [
+                np.full(len(level), 2**h, dtype='f8')
+                for h, level in enumerate(self.levels)
+            ]
+        )
+        order = np.argsort(values, kind='stable')
+        cumulative = np.cumsum(weights[order])
+
+        ranks = qs * cumulative[-1]
+        positions = np.searchsorted(cumulative, ranks, side='left')
+
+        return values[order][np.minimum(positions, len(values) - 1)]
+
+    @property
+    def size(self) -> int:
+        """현재 보관 중인 값의 개수"""
+        return sum(len(level) for level in self.levels)
+
+    def to_dict(self) -> dict:
+        return {
+            'k': self.k,
+            'c': self.c,
+            'n': self.n,
+            'levels': [level.tolist() for level in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> 'KLLSketch':
+        sketch = cls(k=state['k'], c=state['c'])
+        sketch.n = state['n']
+        sketch.levels = [np.array(level, dtype='f8') for level in state['levels']]
+
+        return sketch
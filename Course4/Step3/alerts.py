@@ -0,0 +1,270 @@
+import time
+from collections import defaultdict
+
+from mars_mission_computer import SENSOR_KEYS, DummySensor, MissionComputer
+
+RULE_KINDS = ('threshold', 'rate')
+RULE_OPS = ('above', 'below')
+
+
+class AlertRule:
+    """센서 하나에 대한 경보 조건
+
+    kind가 'threshold'면 값 자체를, 'rate'면 직전 값과의 초당 변화율을 threshold와
+    비교한다. 조건이 for_seconds 동안 계속 유지되어야 경보가 울리고, 울린 뒤에는
+    값이 clear를 넘어 안전한 쪽으로 돌아와야 해제된다(히스테리시스).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        key: str,
+        threshold: float,
+        op: str = 'above',
+        kind: str = 'threshold',
+        clear: float | None = None,
+        for_seconds: float = 0.0,
+        severity: str = 'warning',
+    ) -> None:
+        if kind not in RULE_KINDS:
+            raise ValueError(f'지원하지 않는 규칙 종류입니다: {kind}')
+        if op not in RULE_OPS:
+            raise ValueError(f'지원하지 않는 비교 방향입니다: {op}')
+
+        clear = threshold if clear is None else clear
+        if (op == 'above' and clear > threshold) or (
+            op == 'below' and clear < threshold
+        ):
+            raise ValueError(f'[{name}] 해제 값은 경보 값보다 안전한 쪽이어야 합니다.')
+
+        self.name = name
+        self.key = key
+        self.threshold = threshold
+        self.op = op
+        self.kind = kind
+        self.clear = clear
+        self.for_seconds = for_seconds
+        self.severity = severity
+
+        self.active = False
+        self.pending_since: float | None = None
+
+    def breached(self, value: float) -> bool:
+        if self.op == 'above':
+            return value > self.threshold
+        return value < self.threshold
+
+    def cleared(self, value: float) -> bool:
+        if self.op == 'above':
+            return value <= self.clear
+        return value >= self.clear
+
+    def evaluate(self, value: float, timestamp: float) -> str | None:
+        """상태가 바뀌면 'firing' 또는 'resolved', 아니면 None"""
+        if self.active:
+            if self.cleared(value):
+                self.active = False
+                self.pending_since = None
+                return 'resolved'
+            return None
+
+        if not self.breached(value):
+            self.pending_since = None
+            return None
+
+        if self.pending_since is None:
+            self.pending_since = timestamp
+        if timestamp - self.pending_since >= self.for_seconds:
+            self.active = True
+            return 'firing'
+        return None
+
+
+def default_rules() -> list[AlertRule]:
+    """기지 생명 유지에 중요한 기본 경보 규칙
+
+    규칙이 경보 상태를 가지므로 엔진마다 새로 만든다.
+    """
+    return [
+        AlertRule(
+            'oxygen_low',
+            'mars_base_internal_oxygen',
+            4.5,
+            op='below',
+            clear=4.8,
+            for_seconds=10,
+            severity='critical',
+        ),
+        AlertRule(
+            'co2_high',
+            'mars_base_internal_co2',
+            0.08,
+            op='above',
+            clear=0.07,
+            for_seconds=10,
+            severity='critical',
+        ),
+        AlertRule(
+            'oxygen_falling',
+            'mars_base_internal_oxygen',
+            -0.2,
+            op='below',
+            kind='rate',
+            clear=-0.05,
+        ),
+        AlertRule(
+            'internal_temperature_high',
+            'mars_base_internal_temperature',
+            28,
+            op='above',
+            clear=27,
+            for_seconds=30,
+        ),
+    ]
+
+
+class AlertEngine:
+    """센서 값이 들어올 때마다 관련 규칙만 점진적으로 평가하는 경보 엔진
+
+    규칙을 센서 키별로 색인해 두므로 값 하나를 처리하는 비용은 그 키에 걸린
+    규칙 수에 비례한다. 규칙마다 경보 상태를 기억해서, 울리고 있는 동안에는
+    같은 경보를 다시 보내지 않고 해제될 때 한 번만 알린다. 측정 시각부터
+    처리기 호출이 끝날 때까지의 지연을 기록한다.
+    """
+
+    def __init__(self, rules=None, echo: bool = True) -> None:
+        self.rules: dict[str, list[AlertRule]] = defaultdict(list)
+        self.handlers: list = []
+        self.echo = echo
+
+        # rate 규칙 계산용 키별 직전 (시각, 값)
+        self._previous: dict[str, tuple[float, float]] = {}
+
+        self.readings = 0
+        self.events = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+        for rule in default_rules() if rules is None else rules:
+            self.add_rule(rule)
+
+    def add_rule(self, rule: AlertRule):
+        self.rules[rule.key].append(rule)
+
+    def add_handler(self, callback):
+        """callback(event)를 등록한다. event는 경보 정보를 담은 dict"""
+        self.handlers.append(callback)
+
+    def active(self) -> list[str]:
+        return [
+            rule.name for rules in self.rules.values() for rule in rules if rule.active
+        ]
+
+    def _rates(self, values: dict, timestamp: float) -> dict[str, float]:
+        rates = {}
+        for key, value in values.items():
+            previous = self._previous.get(key)
+            if previous is not None and timestamp > previous[0]:
+                rates[key] = (value - previous[1]) / (timestamp - previous[0])
+            self._previous[key] = (timestamp, value)
+        return rates
+
+    def evaluate(self, values: dict, timestamp: float | None = None) -> list[dict]:
+        """센서 값 하나를 평가하고 이번에 발생/해제된 경보 목록을 반환한다"""
+        timestamp = time.time() if timestamp is None else timestamp
+        self.readings += 1
+
+        watched = {key: values[key] for key in self.rules if key in values}
+        rates = self._rates(watched, timestamp)
+
+        events = []
+        for key, value in watched.items():
+            for rule in self.rules[key]:
+                observed = value
+                if rule.kind == 'rate':
+                    if key not in rates:
+                        continue
+                    observed = rates[key]
+
+                state = rule.evaluate(observed, timestamp)
+                if state is not None:
+                    events.append(
+                        {
+                            'rule': rule.name,
+                            'key': key,
+                            'state': state,
+                            'severity': rule.severity,
+                            'value': observed,
+                            'timestamp': timestamp,
+                        }
+                    )
+
+        for event in events:
+            self._emit(event)
+        return events
+
+    def _emit(self, event: dict):
+        for callback in self.handlers:
+            callback(event)
+        if self.echo:
+            print(
+                f'[경보 {event["state"]}] {event["rule"]} ({event["severity"]}): '
+                f'{event["key"]} = {event["value"]:.4f}'
+            )
+
+        latency = time.time() - event['timestamp']
+        self.events += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def attach(self, computer: MissionComputer):
+        """MissionComputer가 센서 값을 측정할 때마다 평가하도록 연결한다"""
+
+        def on_report(kind: str, values: dict):
+            if kind == 'sensor':
+                self.evaluate(values, computer.last_sensor_time)
+
+        computer.add_listener(on_report)
+
+    def stats(self) -> dict:
+        return {
+            'readings': self.readings,
+            'events': self.events,
+            'active': self.active(),
+            'mean_latency': self.total_latency / self.events if self.events else 0.0,
+            'max_latency': self.max_latency,
+        }
+
+
+def main():
+    # 저장된 배치로 평가 비용을 재고, 실제 컴퓨터에 연결해서 몇 주기 실행한다
+    n = 200_000
+    batch = DummySensor(seed=0).generate_batch(n, start=0.0, interval=5.0)
+    engine = AlertEngine(echo=False)
+
+    start = time.perf_counter()
+    for row in batch.tolist():
+        engine.evaluate(dict(zip(SENSOR_KEYS, row[1:])), row[0])
+    elapsed = time.perf_counter() - start
+
+    print('########## 경보 엔진 ##########')
+    print(
+        f'{n:,}개 평가: {elapsed:.2f}초 ({n / elapsed:,.0f} readings/s), '
+        f'경보 {engine.events:,}건'
+    )
+
+    computer = MissionComputer(DummySensor(), name='Alerts', echo=False)
+    computer.SENSOR_INTERVAL = 0.5
+    engine = AlertEngine()
+    engine.attach(computer)
+    computer.run_scheduler(duration=10)
+
+    stats = engine.stats()
+    print(
+        f'경보 {stats["events"]}건, 평균 지연 {stats["mean_latency"] * 1e6:.0f}us, '
+        f'최대 지연 {stats["max_latency"] * 1e6:.0f}us, 활성 {stats["active"]}'
+    )
+
+
+if __name__ == '__main__':
+    main()
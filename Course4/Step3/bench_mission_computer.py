@@ -0,0 +1,54 @@
+import argparse
+
+from fleet import run_fleet
+
+
+def benchmark_fleet(
+    sizes: tuple[int, ...] = (10, 100, 1000),
+    workers: int | None = None,
+    duration: float = 10.0,
+    sensor_interval: float = 0.1,
+):
+    """노드 수를 늘려 가며 달성한 샘플링 속도, 스케줄링 지연, CPU 사용률 측정"""
+    print('########## 함대 확장성 벤치마크 ##########')
+    print(f'센서 주기 {sensor_interval}초, 노드 수마다 {duration}초 실행')
+    print(
+        f'{"노드":>6} {"워커":>4} {"samples/s":>18} {"달성률":>7} '
+        f'{"평균 지연":>9} {"최대 지연":>9} {"건너뜀":>6} '
+        f'{"워커 CPU":>9} {"집계 CPU":>8}'
+    )
+
+    for n_nodes in sizes:
+        summary = run_fleet(
+            n_nodes,
+            workers,
+            duration,
+            sensor_interval=sensor_interval,
+            load_interval=sensor_interval * 2,
+        )
+        worker_cpu = summary['worker_cpu_percent']
+        mean_worker_cpu = sum(worker_cpu) / len(worker_cpu) if worker_cpu else 0.0
+
+        print(
+            f'{n_nodes:>6} {summary["workers"]:>4} '
+            f'{summary["sample_rate"]:>8,.0f}/{summary["expected_rate"]:<9,.0f} '
+            f'{summary["sample_rate"] / summary["expected_rate"]:>7.1%} '
+            f'{summary["mean_lateness"] * 1e3:>7.2f}ms '
+            f'{summary["max_lateness"] * 1e3:>7.2f}ms '
+            f'{summary["missed"]:>6} '
+            f'{mean_worker_cpu:>8.1f}% '
+            f'{summary["aggregator_cpu_percent"]:>7.1f}%'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='MissionComputer 함대 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--sensor-interval', type=float, default=0.1)
+    args = parser.parse_args()
+
+    benchmark_fleet(
+        tuple(args.sizes), args.workers, args.duration, args.sensor_interval
+    )
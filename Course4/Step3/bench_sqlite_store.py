@@ -0,0 +1,107 @@
+import argparse
+import os
+import time
+
+import numpy as np
+from mars_mission_computer import SENSOR_KEYS, DummySensor
+from sqlite_store import SQLiteStore
+
+HOUR = 3600.0
+
+
+def _query_latency(func, n_queries: int) -> tuple[float, float]:
+    """func를 n_queries번 호출한 (중앙값, 최댓값) 지연(초)"""
+    latencies = []
+    for _ in range(n_queries):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return float(np.median(latencies)), max(latencies)
+
+
+def benchmark_sqlite_store(
+    path: str = 'bench_sensor_history.db',
+    n_rows: int = 100_000_000,
+    chunk_readings: int = 100_000,
+    interval: float = 5.0,
+    n_queries: int = 50,
+):
+    """n_rows행까지 기록하며 지속 기록 속도를 재고, 다 쌓인 뒤 조회 지연을 잰다"""
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    sensor = DummySensor(seed=0)
+    n_readings = n_rows // len(SENSOR_KEYS)
+    report_every = max(n_rows // 10, chunk_readings * len(SENSOR_KEYS))
+
+    print('########## SQLite 저장소 벤치마크 ##########')
+    store = SQLiteStore(path, batch_size=50_000, max_pending=64)
+
+    start = time.perf_counter()
+    last_time, last_rows = start, 0
+    for offset in range(0, n_readings, chunk_readings):
+        n = min(chunk_readings, n_readings - offset)
+        batch = sensor.generate_batch(n, start=offset * interval, interval=interval)
+        values = np.column_stack([batch[key] for key in SENSOR_KEYS])
+        store.extend(batch['timestamp'], values, block=True)
+
+        rows = store.rows_written
+        if rows - last_rows >= report_every:
+            now = time.perf_counter()
+            rate = (rows - last_rows) / (now - last_time)
+            print(f'{rows:>13,}행: {rate:>10,.0f} rows/s')
+            last_time, last_rows = now, rows
+
+    store.flush()
+    elapsed = time.perf_counter() - start
+    dropped = store.stats()['dropped']
+    if dropped:
+        # 일부만 쌓인 테이블의 속도와 조회 지연은 의미가 없으므로 보고하지 않는다
+        print(f'기록되지 않은 행이 {dropped:,}개 있어 벤치마크를 중단합니다.')
+        store.close()
+        return
+
+    total = store.rows_written
+    size = sum(
+        os.path.getsize(path + suffix)
+        for suffix in ('', '-wal')
+        if os.path.exists(path + suffix)
+    )
+    print(
+        f'총 {total:,}행 {elapsed:.1f}초, 평균 {total / elapsed:,.0f} rows/s, '
+        f'파일 {size / 2**30:.2f} GiB'
+    )
+
+    end_time = n_readings * interval
+    rng = np.random.default_rng(1)
+
+    def random_start(span: float) -> float:
+        return float(rng.uniform(0, max(end_time - span, 1.0)))
+
+    def range_query():
+        t = random_start(HOUR)
+        store.query('mars_base_internal_oxygen', t, t + HOUR)
+
+    def hourly_aggregate():
+        t = random_start(24 * HOUR)
+        store.aggregate(t, t + 24 * HOUR, step=HOUR)
+
+    for label, func in (
+        ('1시간 범위 조회 (센서 1개)', range_query),
+        ('1일 범위 시간별 집계 (센서 6개)', hourly_aggregate),
+        ('최신 값', store.latest),
+    ):
+        median, worst = _query_latency(func, n_queries)
+        print(f'{label}: 중앙값 {median * 1e3:.2f}ms, 최대 {worst * 1e3:.2f}ms')
+
+    store.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='SQLite 저장소 벤치마크')
+    parser.add_argument('--rows', type=int, default=100_000_000)
+    parser.add_argument('--path', default='bench_sensor_history.db')
+    args = parser.parse_args()
+
+    benchmark_sqlite_store(args.path, args.rows)
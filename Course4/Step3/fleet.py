@@ -0,0 +1,290 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import queue
+import time
+
+import numpy as np
+from mars_mission_computer import SENSOR_KEYS, DummySensor, MissionComputer
+from metrics_sampler import MetricsSampler
+from numpy.typing import NDArray
+from scheduler import PeriodicScheduler
+
+# 워커가 모은 센서 값을 집계기로 보내는 간격(초)
+FLUSH_INTERVAL = 0.5
+
+
+class _NodeBuffer:
+    """한 워커의 센서 값을 모아 두었다가 배열로 묶어서 보낸다"""
+
+    def __init__(self) -> None:
+        self.node_ids: list[int] = []
+        self.timestamps: list[float] = []
+        self.values: list[list[float]] = []
+
+    def listener(self, node_id: int):
+        def on_report(kind: str, values: dict):
+            if kind != 'sensor':
+                return
+            self.node_ids.append(node_id)
+            self.timestamps.append(time.time())
+            self.values.append([values[key] for key in SENSOR_KEYS])
+
+        return on_report
+
+    def drain(self) -> tuple[NDArray, NDArray, NDArray] | None:
+        if not self.node_ids:
+            return None
+
+        batch = (
+            np.array(self.node_ids, dtype='i4'),
+            np.array(self.timestamps, dtype='f8'),
+            np.array(self.values, dtype='f8'),
+        )
+        self.node_ids, self.timestamps, self.values = [], [], []
+        return batch
+
+
+def _lateness_stats(scheduler: PeriodicScheduler) -> dict:
+    tasks = [task for task in scheduler.tasks if task.runs]
+    runs = sum(task.runs for task in tasks)
+    return {
+        'runs': runs,
+        'missed': sum(task.missed for task in tasks),
+        'mean_lateness': (
+            sum(task.total_lateness for task in tasks) / runs if runs else 0.0
+        ),
+        'max_lateness': max((task.max_lateness for task in tasks), default=0.0),
+    }
+
+
+async def _run_worker(
+    worker_id: int,
+    node_ids: range,
+    results: multiprocessing.Queue,
+    duration: float,
+    sensor_interval: float,
+    load_interval: float,
+):
+    scheduler = PeriodicScheduler()
+    buffer = _NodeBuffer()
+    # 같은 프로세스의 부하는 노드마다 따로 잴 필요가 없으므로 샘플러를 공유한다
+    sampler = MetricsSampler()
+
+    for position, node_id in enumerate(node_ids):
+        computer = MissionComputer(
+            DummySensor(seed=node_id), name=f'Node{node_id:04d}', echo=False
+        )
+        computer.SENSOR_INTERVAL = sensor_interval
+        computer.INFO_INTERVAL = load_interval
+        computer.LOAD_INTERVAL = load_interval
+        computer.metrics = sampler
+        computer.add_listener(buffer.listener(node_id))
+        # 노드들의 실행 시각을 한 주기 안에 고르게 흩어 놓는다
+        computer.build_scheduler(
+            scheduler, start_delay=sensor_interval * position / len(node_ids)
+        )
+
+    def flush():
+        batch = buffer.drain()
+        if batch is not None:
+            results.put(('sensor', worker_id, *batch))
+
+    scheduler.add_task('flush', flush, FLUSH_INTERVAL)
+
+    cpu_start = time.process_time()
+    await scheduler.run(duration)
+    flush()
+
+    results.put(
+        (
+            'done',
+            worker_id,
+            {
+                'nodes': len(node_ids),
+                'cpu_time': time.process_time() - cpu_start,
+                **_lateness_stats(scheduler),
+            },
+        )
+    )
+
+
+def _worker_main(*args):
+    try:
+        asyncio.run(_run_worker(*args))
+    except KeyboardInterrupt:
+        pass
+
+
+class FleetAggregator:
+    """모든 노드의 최신 센서 값과 수신 통계를 노드 번호로 색인한 배열에 보관"""
+
+    def __init__(self, n_nodes: int) -> None:
+        self.n_nodes = n_nodes
+        self.latest = np.full((n_nodes, len(SENSOR_KEYS)), np.nan)
+        self.last_seen = np.zeros(n_nodes, dtype='f8')
+        self.counts = np.zeros(n_nodes, dtype='i8')
+
+        self.received = 0
+        self.batches = 0
+        self.total_delay = 0.0
+        self.max_delay = 0.0
+
+    def ingest(self, node_ids: NDArray, timestamps: NDArray, values: NDArray):
+        # 같은 배치 안에서 한 노드가 여러 번 나오면 마지막 값이 남는다
+        self.latest[node_ids] = values
+        self.last_seen[node_ids] = timestamps
+        self.counts += np.bincount(node_ids, minlength=self.n_nodes)
+
+        delays = time.time() - timestamps
+        self.received += len(node_ids)
+        self.batches += 1
+        self.total_delay += float(delays.sum())
+        self.max_delay = max(self.max_delay, float(delays.max()))
+
+    def fleet_stats(self) -> dict[str, dict]:
+        """센서별로 전체 노드의 최신 값 평균, 최솟값, 최댓값"""
+        reported = ~np.isnan(self.latest[:, 0])
+        if not reported.any():
+            return {key: {} for key in SENSOR_KEYS}
+
+        values = self.latest[reported]
+        means = values.mean(axis=0)
+        mins = values.min(axis=0)
+        maxs = values.max(axis=0)
+        return {
+            key: {'mean': float(means[i]), 'min': float(mins[i]), 'max': float(maxs[i])}
+            for i, key in enumerate(SENSOR_KEYS)
+        }
+
+    def summary(self) -> dict:
+        return {
+            'nodes': self.n_nodes,
+            'reporting_nodes': int((self.counts > 0).sum()),
+            'received': self.received,
+            'batches': self.batches,
+            'mean_delay': self.total_delay / self.received if self.received else 0.0,
+            'max_delay': self.max_delay,
+        }
+
+
+def _split_nodes(n_nodes: int, workers: int) -> list[range]:
+    bounds = np.linspace(0, n_nodes, workers + 1).astype(int)
+    return [range(bounds[i], bounds[i + 1]) for i in range(workers)]
+
+
+def run_fleet(
+    n_nodes: int,
+    workers: int | None = None,
+    duration: float = 10.0,
+    sensor_interval: float = MissionComputer.SENSOR_INTERVAL,
+    load_interval: float = MissionComputer.LOAD_INTERVAL,
+) -> dict:
+    """n_nodes대의 MissionComputer를 workers개 프로세스에 나눠 duration초 실행
+
+    각 워커는 이벤트 루프와 PeriodicScheduler 하나로 맡은 노드를 모두 돌리고,
+    센서 값을 FLUSH_INTERVAL마다 배열로 묶어 큐로 보낸다. 현재 프로세스가
+    집계기 역할을 하며 실행 결과 요약을 반환한다.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, n_nodes))
+    results = multiprocessing.Queue()
+    aggregator = FleetAggregator(n_nodes)
+
+    processes = [
+        multiprocessing.Process(
+            target=_worker_main,
+            args=(i, nodes, results, duration, sensor_interval, load_interval),
+        )
+        for i, nodes in enumerate(_split_nodes(n_nodes, workers))
+    ]
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    for process in processes:
+        process.start()
+
+    worker_stats = {}
+    try:
+        while len(worker_stats) < workers:
+            try:
+                message = results.get(timeout=duration + 30)
+            except queue.Empty:
+                print('응답하지 않는 워커가 있어 집계를 중단합니다.')
+                break
+
+            if message[0] == 'sensor':
+                aggregator.ingest(*message[2:])
+            else:
+                worker_stats[message[1]] = message[2]
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    elapsed = time.perf_counter() - start
+    runs = sum(stats['runs'] for stats in worker_stats.values())
+
+    return {
+        **aggregator.summary(),
+        'workers': workers,
+        'elapsed': elapsed,
+        'expected_rate': n_nodes / sensor_interval,
+        'sample_rate': aggregator.received / duration,
+        'missed': sum(stats['missed'] for stats in worker_stats.values()),
+        'mean_lateness': (
+            sum(
+                stats['mean_lateness'] * stats['runs']
+                for stats in worker_stats.values()
+            )
+            / runs
+            if runs
+            else 0.0
+        ),
+        'max_lateness': max(
+            (stats['max_lateness'] for stats in worker_stats.values()), default=0.0
+        ),
+        # 한 코어를 100%로 본 워커 CPU 사용률
+        'worker_cpu_percent': [
+            100 * worker_stats[i]['cpu_time'] / duration for i in sorted(worker_stats)
+        ],
+        'aggregator_cpu_percent': 100 * (time.process_time() - cpu_start) / elapsed,
+        'fleet': aggregator.fleet_stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MissionComputer 함대 시뮬레이터')
+    parser.add_argument('--nodes', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument(
+        '--sensor-interval', type=float, default=MissionComputer.SENSOR_INTERVAL
+    )
+    args = parser.parse_args()
+
+    summary = run_fleet(args.nodes, args.workers, args.duration, args.sensor_interval)
+
+    print(
+        '#' * 10, f'함대 {summary["nodes"]}대 / 워커 {summary["workers"]}개', '#' * 10
+    )
+    print(
+        f'수신: {summary["received"]:,}건 '
+        f'({summary["reporting_nodes"]}/{summary["nodes"]}대 보고), '
+        f'{summary["sample_rate"]:,.1f}/{summary["expected_rate"]:,.1f} samples/s'
+    )
+    print(
+        f'지연: 평균 {summary["mean_lateness"] * 1e3:.2f}ms, '
+        f'최대 {summary["max_lateness"] * 1e3:.2f}ms, 건너뛴 주기 {summary["missed"]}'
+    )
+    for key, stats in summary['fleet'].items():
+        if stats:
+            print(
+                f'{key}: 평균 {stats["mean"]:.3f}, '
+                f'최소 {stats["min"]:.3f}, 최대 {stats["max"]:.3f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+import asyncio
+import bisect
+import json
+import sys
+import time
+
+# 히스토그램 구간 경계(초): 1us부터 2배씩 약 67초까지
+BUCKET_BOUNDS = tuple(1e-6 * 2**i for i in range(27))
+
+
+class Histogram:
+    """로그 간격 구간에 개수만 세는 지연 히스토그램 (값 하나에 O(log 구간 수))"""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """q(0~1) 분위수가 속한 구간의 상한 (마지막 구간은 최댓값)"""
+        if self.count == 0:
+            return 0.0
+
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS + (self.max,), self.counts):
+            seen += count
+            if count and seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(0.5),
+            'p99': self.percentile(0.99),
+            'max': self.max,
+        }
+
+
+class StageTimer:
+    """한 번의 작업 실행을 단계별로 나눠 잰다. lap은 직전 lap 이후의 시간을 더한다"""
+
+    __slots__ = ('_instrumentation', '_task', '_last', '_stages')
+
+    def __init__(self, instrumentation: 'Instrumentation', task: str) -> None:
+        self._instrumentation = instrumentation
+        self._task = task
+        self._stages: dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        self._stages[stage] = self._stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def done(self, stage: str | None = None):
+        if stage is not None:
+            self.lap(stage)
+        for name, seconds in self._stages.items():
+            self._instrumentation.observe(self._task, name, seconds)
+
+
+class Instrumentation:
+    """주기 작업의 단계별 시간, 스케줄링 지연, CPU 시간을 모으는 계측기
+
+    MissionComputer.instrumentation과 PeriodicScheduler.instrumentation에 넣으면
+    켜지고, None이면 실행 경로에서 속성 확인 한 번만 하므로 비용이 거의 없다.
+    """
+
+    def __init__(self) -> None:
+        self.histograms: dict[str, dict[str, Histogram]] = {}
+        self.cpu_time: dict[str, float] = {}
+        self.started = time.time()
+
+    def _histogram(self, task: str, metric: str) -> Histogram:
+        metrics = self.histograms.get(task)
+        if metrics is None:
+            metrics = self.histograms[task] = {}
+        histogram = metrics.get(metric)
+        if histogram is None:
+            histogram = metrics[metric] = Histogram()
+        return histogram
+
+    def observe(self, task: str, metric: str, seconds: float):
+        self._histogram(task, metric).observe(seconds)
+
+    def timer(self, task: str) -> StageTimer:
+        return StageTimer(self, task)
+
+    def record_task(self, task: str, lateness: float, cpu_time: float):
+        """스케줄러가 작업 하나를 실행할 때마다 호출한다"""
+        self._histogram(task, 'lateness').observe(lateness)
+        self.cpu_time[task] = self.cpu_time.get(task, 0.0) + cpu_time
+
+    def snapshot(self) -> dict:
+        """작업별 {'cpu_time': 초, 'stages': {단계: 요약}}"""
+        tasks = set(self.histograms) | set(self.cpu_time)
+        return {
+            task: {
+                'cpu_time': self.cpu_time.get(task, 0.0),
+                'stages': {
+                    metric: histogram.summary()
+                    for metric, histogram in self.histograms.get(task, {}).items()
+                },
+            }
+            for task in sorted(tasks)
+        }
+
+    def reset(self):
+        self.histograms.clear()
+        self.cpu_time.clear()
+        self.started = time.time()
+
+    def dump(self, file=None):
+        """현재 요약을 JSON 한 줄로 출력한다 (기본값은 stderr)"""
+        record = {'timestamp': time.time(), 'tasks': self.snapshot()}
+        print(json.dumps(record), file=file or sys.stderr, flush=True)
+
+
+def instrument(computer, scheduler=None, dump_interval: float | None = None, file=None):
+    """MissionComputer(와 스케줄러)에 계측기를 연결하고 반환한다
+
+    dump_interval을 주면 그 간격으로 요약을 출력하는 주기 작업을 추가한다.
+    """
+    instrumentation = Instrumentation()
+    computer.instrumentation = instrumentation
+
+    if scheduler is not None:
+        scheduler.instrumentation = instrumentation
+        if dump_interval is not None:
+            scheduler.add_task(
+                f'{computer.name}/instrumentation',
+                lambda: instrumentation.dump(file),
+                dump_interval,
+                start_delay=dump_interval,
+            )
+
+    return instrumentation
+
+
+def _measure_overhead(n: int = 200_000) -> tuple[float, float]:
+    """계측을 끄고 켰을 때 report_sensor_data 한 번의 평균 시간(초)"""
+    from mars_mission_computer import DummySensor, MissionComputer
+
+    computer = MissionComputer(DummySensor(), name='Overhead', echo=False)
+    results = []
+    for instrumentation in (None, Instrumentation()):
+        computer.instrumentation = instrumentation
+        start = time.perf_counter()
+        for _ in range(n):
+            computer.report_sensor_data()
+        results.append((time.perf_counter() - start) / n)
+    return results[0], results[1]
+
+
+def main():
+    from mars_mission_computer import DummySensor, MissionComputer
+
+    disabled, enabled = _measure_overhead()
+    print('########## 계측 비용 ##########')
+    print(
+        f'report_sensor_data: 꺼짐 {disabled * 1e6:.2f}us, '
+        f'켜짐 {enabled * 1e6:.2f}us (+{(enabled - disabled) * 1e6:.2f}us)'
+    )
+
+    computer = MissionComputer(DummySensor(), name='Instrumented')
+    computer.SENSOR_INTERVAL = 0.5
+    computer.LOAD_INTERVAL = 1
+    scheduler = computer.build_scheduler()
+    instrument(computer, scheduler, dump_interval=2.0, file=sys.stdout)
+
+    asyncio.run(scheduler.run(4.5))
+
+
+if __name__ == '__main__':
+    main()
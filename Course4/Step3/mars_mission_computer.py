@@ -1,61 +1,251 @@
+import asyncio
 import json
 import platform
-import random
 import time
 
 import humanize
+import numpy as np
 import psutil
+from metrics_sampler import MetricsSampler
+from numpy.typing import NDArray
+from scheduler import PeriodicScheduler
+
+# 센서별 더미 값 범위 (최솟값, 최댓값)
+SENSOR_RANGES = {
+    'mars_base_internal_temperature': (18, 30),
+    'mars_base_external_temperature': (0, 21),
+    'mars_base_internal_humidity': (50, 60),
+    'mars_base_external_illuminance': (500, 715),
+    'mars_base_internal_co2': (0.02, 0.1),
+    'mars_base_internal_oxygen': (4, 7),
+}
+SENSOR_KEYS = tuple(SENSOR_RANGES)
+_LOWS, _HIGHS = np.array(list(SENSOR_RANGES.values()), dtype='f8').T
+
+# generate_batch가 돌려주는 구조화 배열 형식
+READING_DTYPE = np.dtype([('timestamp', 'f8')] + [(key, 'f8') for key in SENSOR_KEYS])
 
 
 class DummySensor:
-    def __init__(self) -> None:
-        self._env_values = {
-            'mars_base_internal_temperature': 0.0,
-            'mars_base_external_temperature': 0.0,
-            'mars_base_internal_humidity': 0.0,
-            'mars_base_external_illuminance': 0.0,
-            'mars_base_internal_co2': 0.0,
-            'mars_base_internal_oxygen': 0.0,
-        }
+    def __init__(self, seed: int | None = None) -> None:
+        self._env_values = dict.fromkeys(SENSOR_KEYS, 0.0)
+        self._rng = np.random.default_rng(seed)
 
     def set_env(self):
-        self._env_values['mars_base_internal_temperature'] = random.uniform(18, 30)
-        self._env_values['mars_base_external_temperature'] = random.uniform(0, 21)
-        self._env_values['mars_base_internal_humidity'] = random.uniform(50, 60)
-        self._env_values['mars_base_external_illuminance'] = random.uniform(500, 715)
-        self._env_values['mars_base_internal_co2'] = random.uniform(0.02, 0.1)
-        self._env_values['mars_base_internal_oxygen'] = random.uniform(4, 7)
+        # generate_batch와 같은 생성기를 써서 seed가 매 측정에도 적용된다
+        values = self._rng.uniform(_LOWS, _HIGHS).tolist()
+        self._env_values.update(zip(SENSOR_KEYS, values))
 
     def get_env(self) -> dict:
         self.set_env()
         return self._env_values
 
+    def generate_batch(
+        self, n: int, start: float | None = None, interval: float = 5.0
+    ) -> NDArray:
+        """센서 값 n개를 구조화 배열 하나로 생성한다
+
+        같은 seed로 만든 DummySensor는 항상 같은 값을 만든다. timestamp는
+        start부터 interval초 간격이다.
+        """
+        batch = np.empty((n, len(SENSOR_KEYS) + 1), dtype='f8')
+        batch[:, 0] = (time.time() if start is None else start) + np.arange(
+            n
+        ) * interval
+        batch[:, 1:] = self._rng.uniform(_LOWS, _HIGHS, size=(n, len(SENSOR_KEYS)))
+
+        # 같은 메모리를 필드 이름으로 읽을 수 있게 복사 없이 변환
+        return batch.view(READING_DTYPE).reshape(n)
+
 
 class MissionComputer:
+    # 주기 작업 실행 간격(초)
+    SENSOR_INTERVAL = 5
+    INFO_INTERVAL = 10
+    LOAD_INTERVAL = 10
+
     def __init__(
         self,
         sensor_data,
         name: str = 'Computer',
+        sensor_bus=None,
+        history=None,
+        telemetry=None,
+        echo: bool = True,
     ) -> None:
         self.name = name
 
         self._env_values = {}
+        # 마지막으로 센서 값을 읽기 시작한 시각
+        self.last_sensor_time = 0.0
 
         self._system_info = self._collect_system_info()
 
         self.sensor = sensor_data
 
-    def get_sensor_data(self):
+        # 다른 프로세스와 센서 값을 공유할 SensorBus (선택)
+        self.sensor_bus = sensor_bus
+
+        # 센서 값 이력을 보관할 TimeSeriesStore (선택)
+        self.history = history
+
+        self.metrics = MetricsSampler()
+
+        # 센서/부하 값을 기록할 TelemetryWriter (선택)
+        self.telemetry = telemetry
+        # False면 매 주기 JSON 출력을 생략한다
+        self.echo = echo
+
+        # 새 값이 측정될 때마다 (종류, 값)으로 호출할 콜백 목록
+        self.listeners: list = []
+
+        # 단계별 실행 시간을 기록할 Instrumentation (선택, None이면 꺼짐)
+        self.instrumentation = None
+
+    @property
+    def system_info(self) -> dict:
+        return self._system_info
+
+    def add_listener(self, callback):
+        """callback(kind, values)를 등록한다. kind는 'sensor' 또는 'load'"""
+        self.listeners.append(callback)
+
+    def _notify(self, kind: str, values: dict):
+        for callback in self.listeners:
+            callback(kind, values)
+
+    def _timer(self, task: str):
+        if self.instrumentation is None:
+            return None
+        return self.instrumentation.timer(f'{self.name}/{task}')
+
+    def report_sensor_data(self) -> dict:
+        timer = self._timer('sensor')
+        self.last_sensor_time = time.time()
+        self._env_values = self.sensor.get_env()
+        if timer is not None:
+            timer.lap('sample')
+
+        if self.sensor_bus is not None:
+            self.sensor_bus.publish(self._env_values)
+        if self.history is not None:
+            self.history.append(self._env_values)
+        if self.telemetry is not None:
+            self.telemetry.write_sensor(self._env_values)
+        self._notify('sensor', self._env_values)
+
+        if self.echo:
+            if timer is not None:
+                timer.lap('emit')
+            json_data = json.dumps(self._env_values, indent=4)
+            if timer is not None:
+                timer.lap('encode')
+
+            print('\n' + '#' * 10, f'[{self.name}] 센서 데이터', '#' * 10)
+            print(json_data)
+
+        if timer is not None:
+            timer.done('emit')
+        return self._env_values
+
+    def report_mission_computer_info(self) -> dict:
+        if self.echo:
+            timer = self._timer('info')
+            info_json = json.dumps(self._system_info, indent=4)
+            if timer is not None:
+                timer.lap('encode')
+
+            print('\n' + '#' * 10, f'[{self.name}] 컴퓨터 정보', '#' * 10)
+            print(info_json)
+            if timer is not None:
+                timer.done('emit')
+
+        return self._system_info
+
+    def report_mission_computer_load(self) -> dict:
+        """직전 호출 이후의 CPU 사용률과 메모리를 숫자로 측정 (블로킹 없음)"""
+        timer = self._timer('load')
+        computer_load = self.metrics.sample()
+        if timer is not None:
+            timer.lap('sample')
+
+        if self.telemetry is not None:
+            self.telemetry.write_load(computer_load)
+        self._notify('load', computer_load)
+
+        if self.echo:
+            if timer is not None:
+                timer.lap('emit')
+            load_json = json.dumps(computer_load, indent=4)
+            if timer is not None:
+                timer.lap('encode')
+
+            print('\n' + '#' * 10, f'[{self.name}] 실시간 CPU/메모리 사용률', '#' * 10)
+            print(load_json)
+
+        if timer is not None:
+            timer.done('emit')
+        return computer_load
+
+    def build_scheduler(
+        self, scheduler: PeriodicScheduler | None = None, start_delay: float = 0.0
+    ) -> PeriodicScheduler:
+        """세 주기 작업(telemetry가 있으면 flush까지)을 하나의 스케줄러에 등록한다
+
+        여러 컴퓨터가 한 스케줄러를 공유할 때 start_delay를 다르게 주면 같은
+        순간에 몰려서 실행되지 않는다.
+        """
+        scheduler = scheduler or PeriodicScheduler()
+        if scheduler.instrumentation is None:
+            scheduler.instrumentation = self.instrumentation
+        scheduler.add_task(
+            f'{self.name}/sensor',
+            self.report_sensor_data,
+            self.SENSOR_INTERVAL,
+            start_delay=start_delay,
+        )
+        scheduler.add_task(
+            f'{self.name}/info',
+            self.report_mission_computer_info,
+            self.INFO_INTERVAL,
+            start_delay=start_delay,
+        )
+        scheduler.add_task(
+            f'{self.name}/load',
+            self.report_mission_computer_load,
+            self.LOAD_INTERVAL,
+            start_delay=start_delay,
+        )
+        if self.telemetry is not None:
+            # 측정이 뜸해도 버퍼에 남은 프레임이 주기적으로 기록되게 한다
+            scheduler.add_task(
+                f'{self.name}/telemetry',
+                self.telemetry.flush,
+                self.telemetry.flush_interval,
+                start_delay=start_delay,
+            )
+
+        return scheduler
+
+    def run_scheduler(self, duration: float | None = None):
+        """스레드나 프로세스 없이 이벤트 루프 하나에서 모든 주기 작업을 실행"""
+        scheduler = self.build_scheduler()
         try:
-            while True:
-                self._env_values = self.sensor.get_env()
+            asyncio.run(scheduler.run(duration))
+        except KeyboardInterrupt:
+            print(f'\n[{self.name}] Keyboard Interrupt detected.')
+        finally:
+            if self.telemetry is not None:
+                self.telemetry.flush()
 
-                json_data = json.dumps(self._env_values, indent=4)
+        return scheduler.stats()
 
-                print('\n' + '#' * 10, f'[{self.name}] 센서 데이터', '#' * 10)
-                print(json_data)
+    def get_sensor_data(self):
+        try:
+            while True:
+                self.report_sensor_data()
 
-                time.sleep(5)
+                time.sleep(self.SENSOR_INTERVAL)
         except KeyboardInterrupt:
             print(f'\n[{self.name}] Keyboard Interrupt detected.')
         except Exception as e:
@@ -107,38 +297,20 @@ class MissionComputer:
     def get_mission_computer_info(self):
         try:
             while True:
-                info_json = json.dumps(self._system_info, indent=4)
-
-                print('\n' + '#' * 10, f'[{self.name}] 컴퓨터 정보', '#' * 10)
-                print(info_json)
+                self.report_mission_computer_info()
 
                 # time.sleep(20)
-                time.sleep(10)
+                time.sleep(self.INFO_INTERVAL)
         except KeyboardInterrupt:
             print(f'\n[{self.name}] Keyboard Interrupt detected.')
 
     def get_mission_computer_load(self):
         try:
             while True:
-                cpu_usage = psutil.cpu_percent(interval=0.1)
-                memory_usage = humanize.naturalsize(
-                    psutil.Process().memory_info().rss, binary=True
-                )
-
-                computer_load = {
-                    'cpu_usage': cpu_usage,
-                    'memory_usage': memory_usage,
-                }
-
-                load_json = json.dumps(computer_load, indent=4)
-
-                print(
-                    '\n' + '#' * 10, f'[{self.name}] 실시간 CPU/메모리 사용률', '#' * 10
-                )
-                print(load_json)
+                self.report_mission_computer_load()
 
                 # time.sleep(20)
-                time.sleep(10)
+                time.sleep(self.LOAD_INTERVAL)
         except KeyboardInterrupt:
             print(f'\n[{self.name}] Keyboard Interrupt detected.')
 
@@ -189,6 +361,11 @@ if __name__ == '__main__':
     # except KeyboardInterrupt:
     #     print('\nKeyboard Interrupt detected.')
 
+    ###############################################################
+    ##################### 비동기 스케줄러 ##########################
+    # runComputer = MissionComputer(sensor_data=ds, name='Scheduler')
+    # runComputer.run_scheduler()
+
     ###############################################################
     ########################## 문제 4 ##############################
     import multiprocessing
@@ -0,0 +1,202 @@
+import argparse
+import asyncio
+
+from mars_mission_computer import DummySensor, MissionComputer
+
+REQUEST_TIMEOUT = 5.0
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def render_metrics(
+    computer_name: str, sensor_values: dict, system_info: dict, load: dict
+) -> str:
+    """센서 값, 시스템 정보, 부하 지표를 Prometheus 텍스트 형식으로 만든다"""
+    base = _labels(computer=computer_name)
+    lines = []
+
+    def metric(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]):
+        if not samples:
+            return
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(f'{name}{{{labels}}} {value}' for labels, value in samples)
+
+    metric(
+        'mars_sensor_value',
+        'gauge',
+        '최근 센서 측정값',
+        [
+            (f'{base},{_labels(sensor=key)}', float(value))
+            for key, value in sensor_values.items()
+        ],
+    )
+
+    info_labels = _labels(
+        **{key: value for key, value in system_info.items() if key != 'cpu_core'}
+    )
+    metric(
+        'mars_system_info',
+        'gauge',
+        '미션 컴퓨터 시스템 정보',
+        [(f'{base},{info_labels}', 1)],
+    )
+    if system_info.get('cpu_core') is not None:
+        metric(
+            'mars_cpu_cores', 'gauge', 'CPU 코어 수', [(base, system_info['cpu_core'])]
+        )
+
+    gauges = (
+        ('mars_cpu_percent', 'cpu_percent', '전체 CPU 사용률(%)'),
+        ('mars_process_cpu_percent', 'process_cpu_percent', '프로세스 CPU 사용률(%)'),
+        ('mars_process_rss_bytes', 'process_rss', '프로세스 RSS(바이트)'),
+        ('mars_memory_total_bytes', 'memory_total', '전체 메모리(바이트)'),
+        ('mars_memory_available_bytes', 'memory_available', '사용 가능 메모리(바이트)'),
+        ('mars_memory_percent', 'memory_percent', '메모리 사용률(%)'),
+    )
+    for name, key, help_text in gauges:
+        if key in load:
+            metric(name, 'gauge', help_text, [(base, load[key])])
+
+    counters = (
+        ('mars_process_read_bytes_total', 'process_read_bytes', '프로세스 읽기 바이트'),
+        (
+            'mars_process_write_bytes_total',
+            'process_write_bytes',
+            '프로세스 쓰기 바이트',
+        ),
+    )
+    for name, key, help_text in counters:
+        if key in load:
+            metric(name, 'counter', help_text, [(base, load[key])])
+
+    metric(
+        'mars_cpu_core_percent',
+        'gauge',
+        '코어별 CPU 사용률(%)',
+        [
+            (f'{base},{_labels(core=core)}', value)
+            for core, value in enumerate(load.get('cpu_per_core', []))
+        ],
+    )
+
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsEndpoint:
+    """MissionComputer 지표를 /metrics로 제공하는 가벼운 asyncio HTTP 서버
+
+    값이 갱신될 때 응답 전체를 한 번만 만들어 두고, 요청에는 캐시된 바이트를
+    그대로 보내므로 스크레이프가 측정 작업을 막지 않는다.
+    """
+
+    def __init__(
+        self, computer: MissionComputer, host: str = '127.0.0.1', port: int = 9100
+    ) -> None:
+        self.computer = computer
+        self.host = host
+        self.port = port
+        self._sensor_values: dict = {}
+        self._load: dict = {}
+        self._response = b''
+        self._server: asyncio.AbstractServer | None = None
+        self.scrapes = 0
+
+        computer.add_listener(self.update)
+        self.render()
+
+    def update(self, kind: str, values: dict):
+        if kind == 'sensor':
+            self._sensor_values = dict(values)
+        elif kind == 'load':
+            self._load = values
+        self.render()
+
+    def render(self):
+        body = render_metrics(
+            self.computer.name,
+            self._sensor_values,
+            self.computer.system_info,
+            self._load,
+        ).encode('utf-8')
+        self._response = (
+            b'HTTP/1.1 200 OK\r\n'
+            + f'Content-Type: {CONTENT_TYPE}\r\n'.encode()
+            + f'Content-Length: {len(body)}\r\n'.encode()
+            + b'Connection: close\r\n\r\n'
+            + body
+        )
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(
+                reader.readuntil(b'\r\n\r\n'), REQUEST_TIMEOUT
+            )
+            method, path, *_ = request.split(b'\r\n', 1)[0].split(b' ')
+
+            if method == b'GET' and path.split(b'?', 1)[0] == b'/metrics':
+                self.scrapes += 1
+                writer.write(self._response)
+            else:
+                writer.write(
+                    b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n'
+                    b'Connection: close\r\n\r\n'
+                )
+            await writer.drain()
+        except (TimeoutError, ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # port=0이면 운영체제가 고른 포트를 기록한다
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def serve(
+    computer: MissionComputer,
+    host: str = '127.0.0.1',
+    port: int = 9100,
+    duration: float | None = None,
+):
+    """주기 작업과 /metrics 서버를 같은 이벤트 루프에서 실행"""
+    endpoint = MetricsEndpoint(computer, host, port)
+    await endpoint.start()
+    print(f'[{computer.name}] http://{endpoint.host}:{endpoint.port}/metrics')
+
+    try:
+        await computer.build_scheduler().run(duration)
+    finally:
+        await endpoint.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MissionComputer 지표 엔드포인트')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100)
+    args = parser.parse_args()
+
+    computer = MissionComputer(DummySensor(), name='Computer', echo=False)
+    try:
+        asyncio.run(serve(computer, args.host, args.port))
+    except KeyboardInterrupt:
+        print('\nKeyboard Interrupt detected.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import time
+
+import psutil
+
+
+class MetricsSampler:
+    """블로킹 없이 시스템/프로세스 지표를 숫자로 수집하는 샘플러
+
+    psutil 핸들을 한 번만 만들고, CPU 사용률은 interval 없이 직전 호출과의 차이로
+    계산한다. 샘플링에 쓴 시간이 경과 시간의 overhead_budget 비율을 넘지 않도록,
+    너무 자주 호출되면 마지막 샘플을 그대로 돌려준다.
+    """
+
+    def __init__(self, overhead_budget: float = 0.01) -> None:
+        self.overhead_budget = overhead_budget
+
+        self._process = psutil.Process()
+        self._has_io = hasattr(self._process, 'io_counters')
+
+        # 첫 호출은 기준점만 잡으므로 미리 한 번 호출해 둔다
+        psutil.cpu_percent(interval=None, percpu=True)
+        self._process.cpu_percent(interval=None)
+
+        self._started = time.perf_counter()
+        self._next_allowed = self._started
+        self._last: dict | None = None
+
+        self.samples = 0
+        self.skipped = 0
+        self.sampling_time = 0.0
+
+    def _collect(self) -> dict:
+        per_core = psutil.cpu_percent(interval=None, percpu=True)
+        memory = psutil.virtual_memory()
+
+        with self._process.oneshot():
+            sample = {
+                'timestamp': time.time(),
+                'cpu_percent': sum(per_core) / len(per_core) if per_core else 0.0,
+                'cpu_per_core': per_core,
+                'process_cpu_percent': self._process.cpu_percent(interval=None),
+                'process_rss': self._process.memory_info().rss,
+                'memory_total': memory.total,
+                'memory_available': memory.available,
+                'memory_percent': memory.percent,
+            }
+
+            if self._has_io:
+                try:
+                    io = self._process.io_counters()
+                    sample['process_read_bytes'] = io.read_bytes
+                    sample['process_write_bytes'] = io.write_bytes
+                except (psutil.AccessDenied, NotImplementedError):
+                    self._has_io = False
+
+        return sample
+
+    def sample(self) -> dict:
+        now = time.perf_counter()
+        if self._last is not None and now < self._next_allowed:
+            self.skipped += 1
+            return self._last
+
+        self._last = self._collect()
+        cost = time.perf_counter() - now
+
+        self.samples += 1
+        self.sampling_time += cost
+        # 이번 비용을 예산 비율로 나눈 시간 동안은 다시 수집하지 않는다
+        self._next_allowed = now + cost / self.overhead_budget
+
+        return self._last
+
+    def overhead(self) -> dict:
+        elapsed = time.perf_counter() - self._started
+        return {
+            'samples': self.samples,
+            'skipped': self.skipped,
+            'mean_cost': self.sampling_time / self.samples if self.samples else 0.0,
+            'overhead_ratio': self.sampling_time / elapsed if elapsed > 0 else 0.0,
+        }
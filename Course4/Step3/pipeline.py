@@ -0,0 +1,304 @@
+import json
+import threading
+import time
+from collections import deque
+
+from mars_mission_computer import DummySensor, MissionComputer
+
+POLICIES = ('drop_oldest', 'block', 'sample')
+
+
+class BoundedQueue:
+    """크기가 정해진 스레드 안전 큐와 가득 찼을 때의 처리 정책
+
+    - drop_oldest: 가장 오래된 항목을 버리고 새 항목을 넣는다 (기본값)
+    - block: 공간이 날 때까지 최대 block_timeout초 기다리고, 그래도 없으면 버린다.
+      기다리는 동안 넣는 쪽이 멈추므로 측정 루프에는 쓰지 않는 편이 좋다.
+    - sample: 절반 이상 차면 sample_every개 중 하나만 받고, 가득 차면 새 항목을
+      버린다
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        policy: str = 'drop_oldest',
+        block_timeout: float = 0.1,
+        sample_every: int = 4,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f'지원하지 않는 정책입니다: {policy}')
+        if maxsize <= 0:
+            raise ValueError('큐 크기는 0보다 커야 합니다.')
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.sample_every = sample_every
+
+        self._items: deque = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._offered = 0
+        self._closed = False
+
+        self.put_count = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _admit(self) -> bool:
+        """락을 잡은 상태에서 새 항목을 넣을 수 있으면 True (정책 적용)"""
+        if self.policy == 'drop_oldest':
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            return True
+
+        if self.policy == 'sample':
+            self._offered += 1
+            if len(self._items) >= self.maxsize:
+                return False
+            if len(self._items) >= self.maxsize // 2:
+                return self._offered % self.sample_every == 0
+            return True
+
+        deadline = time.monotonic() + self.block_timeout
+        while len(self._items) >= self.maxsize and not self._closed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._not_full.wait(remaining)
+        return True
+
+    def put(self, item) -> bool:
+        with self._lock:
+            if self._closed or not self._admit():
+                self.dropped += 1
+                return False
+
+            self._items.append(item)
+            self.put_count += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._not_empty.notify()
+            return True
+
+    def get_batch(self, max_items: int, timeout: float | None = None) -> list:
+        """최대 max_items개를 꺼낸다. 비어 있으면 timeout초까지 기다린다"""
+        with self._lock:
+            if not self._items and not self._closed:
+                self._not_empty.wait(timeout)
+
+            batch = []
+            while self._items and len(batch) < max_items:
+                batch.append(self._items.popleft())
+            if batch:
+                self._not_full.notify_all()
+            return batch
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+class Sink:
+    """BoundedQueue 하나와 그 큐를 비우는 전용 스레드"""
+
+    def __init__(self, name: str, func, queue: BoundedQueue, batch_size: int) -> None:
+        self.name = name
+        self.func = func
+        self.queue = queue
+        self.batch_size = batch_size
+
+        self.processed = 0
+        self.errors = 0
+        self.busy_time = 0.0
+
+        self._thread = threading.Thread(target=self._run, name=f'sink-{name}')
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = self.queue.get_batch(self.batch_size, timeout=0.5)
+            if not batch:
+                if self.queue.closed:
+                    return
+                continue
+
+            start = time.perf_counter()
+            for item in batch:
+                try:
+                    self.func(item)
+                except Exception as e:
+                    self.errors += 1
+                    print(f'[{self.name}] 오류 발생: {e}')
+            self.busy_time += time.perf_counter() - start
+            self.processed += len(batch)
+
+    def join(self, timeout: float | None = None):
+        self._thread.join(timeout)
+
+    def metrics(self) -> dict:
+        return {
+            'policy': self.queue.policy,
+            'depth': len(self.queue),
+            'max_depth': self.queue.max_depth,
+            'capacity': self.queue.maxsize,
+            'put': self.queue.put_count,
+            'dropped': self.queue.dropped,
+            'processed': self.processed,
+            'errors': self.errors,
+            'busy_time': self.busy_time,
+        }
+
+
+class SensorPipeline:
+    """측정과 출력/저장을 분리하는 생산자/소비자 파이프라인
+
+    MissionComputer에 연결하면 측정할 때마다 (종류, 시각, 값 복사본)을 모든 싱크의
+    큐에 넣기만 하고 바로 돌아온다. 출력, 직렬화, 저장은 싱크마다 따로 있는
+    스레드에서 실행되므로 느린 싱크가 있어도 측정 주기는 흔들리지 않는다.
+    """
+
+    def __init__(self) -> None:
+        self.sinks: dict[str, Sink] = {}
+        self.published = 0
+
+    def add_sink(
+        self,
+        name: str,
+        func,
+        maxsize: int = 1024,
+        policy: str = 'drop_oldest',
+        batch_size: int = 64,
+        **options,
+    ) -> Sink:
+        """func(item)를 실행할 싱크를 추가한다. item은 (종류, 시각, 값)"""
+        if name in self.sinks:
+            raise ValueError(f'이미 등록된 싱크입니다: {name}')
+
+        sink = Sink(name, func, BoundedQueue(maxsize, policy, **options), batch_size)
+        self.sinks[name] = sink
+        sink.start()
+        return sink
+
+    def publish(self, kind: str, values: dict, timestamp: float | None = None):
+        item = (kind, time.time() if timestamp is None else timestamp, dict(values))
+        self.published += 1
+        for sink in self.sinks.values():
+            sink.queue.put(item)
+
+    def attach(self, computer: MissionComputer):
+        """MissionComputer의 측정값을 파이프라인으로 보낸다 (직접 출력은 끈다)"""
+        computer.echo = False
+
+        def on_report(kind: str, values: dict):
+            timestamp = computer.last_sensor_time if kind == 'sensor' else None
+            self.publish(kind, values, timestamp)
+
+        computer.add_listener(on_report)
+
+    def metrics(self) -> dict:
+        return {
+            'published': self.published,
+            'sinks': {name: sink.metrics() for name, sink in self.sinks.items()},
+        }
+
+    def close(self, timeout: float | None = 5.0):
+        """큐에 남은 항목을 모두 처리한 뒤 싱크 스레드를 종료한다"""
+        for sink in self.sinks.values():
+            sink.queue.close()
+        for sink in self.sinks.values():
+            sink.join(timeout)
+
+    def __enter__(self) -> 'SensorPipeline':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def console_sink(name: str):
+    """MissionComputer의 echo 출력과 같은 형식으로 출력하는 싱크 함수"""
+    titles = {'sensor': '센서 데이터', 'load': '실시간 CPU/메모리 사용률'}
+
+    def emit(item):
+        kind, _, values = item
+        print('\n' + '#' * 10, f'[{name}] {titles.get(kind, kind)}', '#' * 10)
+        print(json.dumps(values, indent=4))
+
+    return emit
+
+
+def telemetry_sink(writer):
+    """TelemetryWriter에 기록하는 싱크 함수"""
+
+    def emit(item):
+        kind, timestamp, values = item
+        if kind == 'sensor':
+            writer.write_sensor(values, timestamp)
+        elif kind == 'load':
+            writer.write_load(values, timestamp)
+
+    return emit
+
+
+def history_sink(store):
+    """TimeSeriesStore/RollupStore에 센서 값을 쌓는 싱크 함수"""
+
+    def emit(item):
+        kind, timestamp, values = item
+        if kind == 'sensor':
+            store.append(values, timestamp)
+
+    return emit
+
+
+def main():
+    # 측정 주기보다 훨씬 느린 싱크를 붙여도 측정 지연이 늘지 않는지 확인한다
+    computer = MissionComputer(DummySensor(), name='Pipeline')
+    computer.SENSOR_INTERVAL = 0.01
+
+    pipeline = SensorPipeline()
+    pipeline.attach(computer)
+    pipeline.add_sink('slow_storage', lambda item: time.sleep(0.05), maxsize=64)
+    pipeline.add_sink(
+        'sampled_storage', lambda item: time.sleep(0.05), maxsize=64, policy='sample'
+    )
+    pipeline.add_sink(
+        'blocking_storage',
+        lambda item: time.sleep(0.002),
+        maxsize=256,
+        policy='block',
+    )
+
+    stats = computer.run_scheduler(duration=5)
+    pipeline.close()
+
+    sensor = stats['Pipeline/sensor']
+    print('########## 파이프라인 ##########')
+    print(
+        f'측정 {sensor["runs"]}회, 평균 지연 {sensor["mean_lateness"] * 1e3:.2f}ms, '
+        f'최대 지연 {sensor["max_lateness"] * 1e3:.2f}ms'
+    )
+    for name, metrics in pipeline.metrics()['sinks'].items():
+        print(
+            f'{name} ({metrics["policy"]}): 처리 {metrics["processed"]}, '
+            f'버림 {metrics["dropped"]}, 최대 깊이 '
+            f'{metrics["max_depth"]}/{metrics["capacity"]}'
+        )
+
+
+if __name__ == '__main__':
+    main()
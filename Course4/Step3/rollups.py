@@ -0,0 +1,273 @@
+import math
+import time
+
+import numpy as np
+from mars_mission_computer import SENSOR_KEYS, DummySensor
+from numpy.typing import NDArray
+from timeseries_store import TimeSeriesStore
+
+MINUTE = 60.0
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# (이름, 구간 길이, 보관 기간)
+DEFAULT_LEVELS = (
+    ('1m', MINUTE, 7 * DAY),
+    ('1h', HOUR, 90 * DAY),
+    ('1d', DAY, 5 * 365 * DAY),
+)
+
+
+class RollupLevel:
+    """한 해상도의 구간별 (개수, 최솟값, 최댓값, 합계)를 보관하는 링 버퍼
+
+    구간 번호(timestamp // step)를 용량으로 나눈 나머지가 곧 슬롯이므로 값 하나를
+    반영하는 비용은 O(센서 수)이다. 슬롯에 적힌 구간 시작 시각이 다르면 보관 기간이
+    지난 구간이므로 새 구간으로 덮어쓴다.
+    """
+
+    def __init__(
+        self, name: str, step: float, retention: float, n_keys: int = len(SENSOR_KEYS)
+    ) -> None:
+        self.name = name
+        self.step = step
+        self.retention = retention
+        self.capacity = math.ceil(retention / step) + 1
+
+        self.starts = np.full(self.capacity, -np.inf)
+        self.counts = np.zeros(self.capacity, dtype='i8')
+        self.mins = np.zeros((self.capacity, n_keys))
+        self.maxs = np.zeros((self.capacity, n_keys))
+        self.sums = np.zeros((self.capacity, n_keys))
+
+        self.latest = -np.inf  # 지금까지 본 가장 최근 구간 시작 시각
+        self.dropped = 0  # 보관 기간보다 늦게 도착해서 버린 값 수
+
+    def _slot(self, timestamp: float) -> int | None:
+        bucket = timestamp // self.step
+        start = bucket * self.step
+        if start <= self.latest - self.retention:
+            self.dropped += 1
+            return None
+
+        slot = int(bucket % self.capacity)
+        if self.starts[slot] != start:
+            self.starts[slot] = start
+            self.counts[slot] = 0
+        self.latest = max(self.latest, start)
+        return slot
+
+    def append(self, values: NDArray, timestamp: float):
+        slot = self._slot(timestamp)
+        if slot is None:
+            return
+
+        if self.counts[slot] == 0:
+            self.mins[slot] = values
+            self.maxs[slot] = values
+            self.sums[slot] = values
+        else:
+            np.minimum(self.mins[slot], values, out=self.mins[slot])
+            np.maximum(self.maxs[slot], values, out=self.maxs[slot])
+            self.sums[slot] += values
+        self.counts[slot] += 1
+
+    def covers(self, start: float, now: float) -> bool:
+        return start > now - self.retention
+
+    def query(self, start: float, end: float) -> dict:
+        """[start, end) 구간과 겹치는 채워진 구간들을 시간 순서로 반환"""
+        first = math.floor(max(start, self.latest - self.retention) / self.step)
+        last = math.ceil(end / self.step)
+        if last <= first:
+            return _empty_result(self.name, self.step, self.sums.shape[1])
+
+        buckets = np.arange(first, last)
+        slots = buckets % self.capacity
+        filled = (self.starts[slots] == buckets * self.step) & (self.counts[slots] > 0)
+        slots = slots[filled]
+
+        counts = self.counts[slots]
+        return {
+            'resolution': self.name,
+            'step': self.step,
+            'timestamps': self.starts[slots],
+            'count': counts,
+            'min': self.mins[slots],
+            'max': self.maxs[slots],
+            'mean': self.sums[slots] / counts[:, None],
+        }
+
+
+def _empty_result(name: str, step: float, n_keys: int) -> dict:
+    return {
+        'resolution': name,
+        'step': step,
+        'timestamps': np.empty(0),
+        'count': np.empty(0, dtype='i8'),
+        'min': np.empty((0, n_keys)),
+        'max': np.empty((0, n_keys)),
+        'mean': np.empty((0, n_keys)),
+    }
+
+
+def _regroup(result: dict, start: float, step: float) -> dict:
+    """더 촘촘한 구간들을 step 길이의 구간으로 합친다 (시간 순서 가정)"""
+    if len(result['timestamps']) == 0 or step <= result['step']:
+        return result
+
+    groups = ((result['timestamps'] - start) // step).astype('i8')
+    # 새 구간이 시작되는 위치마다 reduceat으로 한 번에 합친다
+    edges = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    counts = result['count']
+    sums = result['mean'] * counts[:, None]
+
+    merged_counts = np.add.reduceat(counts, edges)
+    return {
+        'resolution': result['resolution'],
+        'step': step,
+        'timestamps': start + groups[edges] * step,
+        'count': merged_counts,
+        'min': np.minimum.reduceat(result['min'], edges),
+        'max': np.maximum.reduceat(result['max'], edges),
+        'mean': np.add.reduceat(sums, edges) / merged_counts[:, None],
+    }
+
+
+class RollupStore:
+    """센서 값을 들어오는 즉시 1분/1시간/1일 구간으로 요약해서 보관하는 저장소
+
+    MissionComputer의 history로 넘기면 매 측정마다 append가 호출된다. raw에
+    TimeSeriesStore를 주면 원본 값도 짧게 보관해서 가장 촘촘한 조회에 쓴다.
+    """
+
+    def __init__(
+        self,
+        keys: tuple[str, ...] = SENSOR_KEYS,
+        levels=DEFAULT_LEVELS,
+        raw: TimeSeriesStore | None = None,
+    ) -> None:
+        self.keys = keys
+        self.levels = sorted(
+            (
+                RollupLevel(name, step, retention, len(keys))
+                for name, step, retention in levels
+            ),
+            key=lambda level: level.step,
+        )
+        self.raw = raw
+        self._index = {key: i for i, key in enumerate(keys)}
+        self.last_timestamp = -np.inf
+
+    def append(self, values, timestamp: float | None = None):
+        if isinstance(values, dict):
+            values = [values[key] for key in self.keys]
+        timestamp = time.time() if timestamp is None else timestamp
+        values = np.asarray(values, dtype='f8')
+
+        if self.raw is not None:
+            self.raw.append(values, timestamp)
+        for level in self.levels:
+            level.append(values, timestamp)
+        self.last_timestamp = max(self.last_timestamp, timestamp)
+
+    def extend(self, timestamps: NDArray, values: NDArray):
+        """(n,) 시각과 (n, 센서 수) 값을 차례로 반영한다"""
+        for timestamp, row in zip(timestamps.tolist(), values):
+            self.append(row, timestamp)
+
+    def choose(self, start: float, step: float | None = None):
+        """조회 범위와 step을 만족하는 가장 거친 해상도 (raw는 None)"""
+        now = self.last_timestamp
+        step = 0.0 if step is None else step
+
+        candidates = [level for level in self.levels if level.covers(start, now)]
+        fine_enough = [level for level in candidates if level.step <= step]
+        if fine_enough:
+            return fine_enough[-1]
+
+        if self.raw is not None and start >= now - self.raw.retention:
+            return None
+        if candidates:
+            # 요청한 step보다 거칠지만 범위를 담을 수 있는 가장 촘촘한 해상도
+            return candidates[0]
+        return self.levels[-1]
+
+    def _raw_result(self, start: float, end: float) -> dict:
+        timestamps, values = self.raw.window(end - start, end)
+        keep = (timestamps >= start) & (timestamps < end)
+        timestamps, values = timestamps[keep], values[keep]
+        return {
+            'resolution': 'raw',
+            'step': 0.0,
+            'timestamps': timestamps,
+            'count': np.ones(len(timestamps), dtype='i8'),
+            'min': values,
+            'max': values,
+            'mean': values,
+        }
+
+    def query(
+        self,
+        start: float,
+        end: float | None = None,
+        step: float | None = None,
+        keys=None,
+    ) -> dict:
+        """[start, end) 범위를 step 간격의 (개수, 최솟값, 최댓값, 평균)으로 반환
+
+        step을 만족하는 가장 거친 해상도를 골라 읽은 뒤, step이 더 크면 다시 합친다.
+        결과의 resolution에 실제로 읽은 해상도가 들어 있다.
+        """
+        end = self.last_timestamp + 1e-9 if end is None else end
+        level = self.choose(start, step)
+
+        if level is None:
+            result = self._raw_result(start, end)
+        else:
+            result = level.query(start, end)
+        if step is not None:
+            result = _regroup(result, start, step)
+
+        if keys is not None:
+            columns = [self._index[key] for key in keys]
+            for field in ('min', 'max', 'mean'):
+                result[field] = result[field][:, columns]
+        return result
+
+    def dropped(self) -> dict[str, int]:
+        return {level.name: level.dropped for level in self.levels}
+
+
+def main():
+    # 5초 간격 30일치 값을 넣고 범위별로 어떤 해상도가 선택되는지 확인한다
+    n = 30 * int(DAY / 5)
+    batch = DummySensor(seed=0).generate_batch(n, start=0.0, interval=5.0)
+    timestamps = batch['timestamp']
+    values = np.column_stack([batch[key] for key in SENSOR_KEYS])
+
+    store = RollupStore(raw=TimeSeriesStore(retention=HOUR))
+    started = time.perf_counter()
+    store.extend(timestamps, values)
+    elapsed = time.perf_counter() - started
+
+    print('########## 센서 롤업 ##########')
+    print(f'{n:,}개 반영: {elapsed:.2f}초 ({n / elapsed:,.0f} readings/s)')
+
+    now = store.last_timestamp
+    for label, span, step in (
+        ('최근 10분, 5초', 10 * MINUTE, 5.0),
+        ('최근 6시간, 5분', 6 * HOUR, 5 * MINUTE),
+        ('최근 3일, 1시간', 3 * DAY, HOUR),
+        ('최근 30일, 1일', 30 * DAY, DAY),
+    ):
+        result = store.query(now - span, step=step, keys=('mars_base_internal_oxygen',))
+        print(
+            f'{label}: {result["resolution"]} 해상도, '
+            f'구간 {len(result["timestamps"])}개, '
+            f'산소 평균 {result["mean"].mean():.3f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+import asyncio
+import heapq
+import inspect
+import math
+import time
+
+
+class PeriodicTask:
+    def __init__(
+        self,
+        name: str,
+        func,
+        interval: float,
+        timeout: float | None = None,
+        start_delay: float = 0.0,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError('실행 주기는 0보다 커야 합니다.')
+
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.timeout = timeout
+        self.start_delay = start_delay
+        self.is_async = inspect.iscoroutinefunction(func)
+
+        self.runs = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.missed = 0  # 늦어져서 건너뛴 주기 수
+        self.overruns = 0  # 이전 실행이 끝나지 않아 건너뛴 횟수
+        self.max_lateness = 0.0
+        self.total_lateness = 0.0
+        self.running: asyncio.Task | None = None
+
+    def stats(self) -> dict:
+        return {
+            'runs': self.runs,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'missed': self.missed,
+            'overruns': self.overruns,
+            'max_lateness': self.max_lateness,
+            'mean_lateness': self.total_lateness / self.runs if self.runs else 0.0,
+        }
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class PeriodicScheduler:
+    """하나의 이벤트 루프에서 여러 주기 작업을 실행하는 스케줄러
+
+    작업마다 asyncio.Task를 두지 않고, 다음 실행 시각 기준 힙 하나로 가장 이른
+    작업까지만 잠들기 때문에 작업이 수백 개여도 깨어나는 횟수가 실제 실행 횟수와
+    같다. 실행 시각은 시작 시각 + n * interval로 계산해서 누적 드리프트가 없다.
+
+    timeout이 없는 일반 함수는 루프 안에서 바로 실행되므로 짧은 작업이어야 한다.
+    timeout이 있는 일반 함수는 기본 스레드 풀에서, 코루틴 함수는 별도 Task로
+    실행되고 timeout이 적용되며, 이전 실행이 끝나지 않았으면 이번 주기는
+    건너뛴다. 시간을 넘긴 일반 함수의 스레드는 멈출 수 없으므로 끝날 때까지 다음
+    실행이 건너뛰어진다.
+    """
+
+    def __init__(self) -> None:
+        self.tasks: list[PeriodicTask] = []
+        self._stopping = False
+        self._wakeup: asyncio.Future | None = None
+        # 지연과 CPU 시간을 기록할 Instrumentation (선택)
+        self.instrumentation = None
+
+    def add_task(
+        self,
+        name: str,
+        func,
+        interval: float,
+        timeout: float | None = None,
+        start_delay: float = 0.0,
+    ) -> PeriodicTask:
+        task = PeriodicTask(name, func, interval, timeout, start_delay)
+        self.tasks.append(task)
+        return task
+
+    def stop(self):
+        self._stopping = True
+        if self._wakeup is not None:
+            _wake(self._wakeup)
+
+    def stats(self) -> dict[str, dict]:
+        return {task.name: task.stats() for task in self.tasks}
+
+    async def _sleep_until(self, loop: asyncio.AbstractEventLoop, deadline: float):
+        self._wakeup = loop.create_future()
+        handle = loop.call_at(deadline, _wake, self._wakeup)
+        try:
+            await self._wakeup
+        finally:
+            handle.cancel()
+            self._wakeup = None
+
+    async def _run_async(self, loop: asyncio.AbstractEventLoop, task: PeriodicTask):
+        try:
+            if task.is_async:
+                await asyncio.wait_for(task.func(), task.timeout)
+            else:
+                # shield로 감싸서 시간을 넘겨도 스레드가 끝날 때까지 running이 유지된다
+                future = loop.run_in_executor(None, task.func)
+                try:
+                    await asyncio.wait_for(asyncio.shield(future), task.timeout)
+                except TimeoutError:
+                    task.timeouts += 1
+                    await future
+        except TimeoutError:
+            task.timeouts += 1
+        except Exception as e:
+            task.errors += 1
+            print(f'[{task.name}] 오류 발생: {e}')
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop, task: PeriodicTask):
+        task.runs += 1
+
+        if not task.is_async and task.timeout is None:
+            try:
+                task.func()
+            except Exception as e:
+                task.errors += 1
+                print(f'[{task.name}] 오류 발생: {e}')
+            return
+
+        if task.running is not None and not task.running.done():
+            task.overruns += 1
+            return
+        task.running = loop.create_task(self._run_async(loop, task))
+
+    async def run(self, duration: float | None = None):
+        """stop()이 호출되거나 duration초가 지날 때까지 작업을 실행한다
+
+        종료되거나 취소되면 실행 중인 비동기 작업도 모두 취소하고 기다린다.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        end = math.inf if duration is None else start + duration
+        self._stopping = False
+
+        heap = [
+            (start + task.start_delay, i, task) for i, task in enumerate(self.tasks)
+        ]
+        heapq.heapify(heap)
+
+        try:
+            while heap and not self._stopping:
+                deadline, i, task = heap[0]
+                if deadline >= end:
+                    await self._sleep_until(loop, end)
+                    break
+
+                if deadline > loop.time():
+                    await self._sleep_until(loop, deadline)
+                    continue
+
+                lateness = loop.time() - deadline
+                task.max_lateness = max(task.max_lateness, lateness)
+                task.total_lateness += lateness
+                if self.instrumentation is None:
+                    self._dispatch(loop, task)
+                else:
+                    # 비동기 작업은 Task를 만드는 데 쓴 CPU 시간만 잡힌다
+                    cpu_start = time.thread_time()
+                    self._dispatch(loop, task)
+                    self.instrumentation.record_task(
+                        task.name, lateness, time.thread_time() - cpu_start
+                    )
+
+                # 늦어진 만큼의 주기는 몰아서 실행하지 않고 건너뛴다
+                missed = int((loop.time() - deadline) // task.interval)
+                task.missed += missed
+                heapq.heapreplace(
+                    heap, (deadline + (missed + 1) * task.interval, i, task)
+                )
+        finally:
+            running = [
+                task.running
+                for task in self.tasks
+                if task.running is not None and not task.running.done()
+            ]
+            for pending in running:
+                pending.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
@@ -0,0 +1,219 @@
+import multiprocessing
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+from mars_mission_computer import SENSOR_KEYS, DummySensor, MissionComputer
+from numpy.typing import NDArray
+
+# 헤더 레이아웃 (uint64): [매직 넘버, 용량, 필드 수, 누적 쓰기 횟수]
+_MAGIC = 0x4D41525342555331  # 'MARSBUS1'
+_HEADER_WORDS = 4
+_SEQ = 3
+# latest가 쓰는 도중인 슬롯을 다시 읽는 최대 횟수
+_MAX_READ_RETRIES = 100
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """resource_tracker에 등록하지 않고 기존 공유 메모리에 붙는다
+
+    등록되면 붙기만 한 프로세스가 종료될 때 추적기가 메모리를 지워 버린다.
+    3.12 이하에는 track 인자가 없어서 붙는 동안만 등록을 건너뛴다. 붙은 뒤에
+    unregister하면 부모의 추적기를 공유하는 자식 프로세스에서는 만든 쪽의 등록까지
+    지워지므로 그 방법은 쓰지 않는다.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SensorBus:
+    """공유 메모리 위의 고정 레이아웃 센서 링 버퍼
+
+    한 프로세스가 publish로 쓰고, 여러 프로세스가 이름으로 attach해서 pickle 없이
+    같은 메모리를 읽는다. 각 슬롯에는 float64 [타임스탬프, 센서 값...]과 그 슬롯에
+    마지막으로 쓴 순번이 저장되며, 읽는 쪽은 순번을 앞뒤로 확인해서 쓰는 도중의
+    값을 걸러낸다.
+    """
+
+    def __init__(
+        self,
+        name: str | None = None,
+        capacity: int = 1024,
+        fields: tuple[str, ...] = SENSOR_KEYS,
+        create: bool = True,
+    ) -> None:
+        self.fields = fields
+        width = len(fields) + 1  # 타임스탬프 포함
+
+        if create:
+            size = 8 * (_HEADER_WORDS + capacity + capacity * width)
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self._shm = _attach_untracked(name)
+
+        header = np.ndarray((_HEADER_WORDS,), dtype='u8', buffer=self._shm.buf)
+        if create:
+            header[:] = (_MAGIC, capacity, len(fields), 0)
+        elif header[0] != _MAGIC or header[2] != len(fields):
+            self._shm.close()
+            raise ValueError(f'센서 버스 형식이 맞지 않습니다: {name}')
+
+        self.capacity = int(header[1])
+        self._last: tuple[int, NDArray] | None = None
+        self._header = header
+        self._slot_seq = np.ndarray(
+            (self.capacity,), dtype='u8', buffer=self._shm.buf, offset=8 * _HEADER_WORDS
+        )
+        self._data = np.ndarray(
+            (self.capacity, width),
+            dtype='f8',
+            buffer=self._shm.buf,
+            offset=8 * (_HEADER_WORDS + self.capacity),
+        )
+
+    @classmethod
+    def attach(cls, name: str, fields: tuple[str, ...] = SENSOR_KEYS) -> 'SensorBus':
+        return cls(name=name, fields=fields, create=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def seq(self) -> int:
+        """지금까지 기록된 값의 개수"""
+        return int(self._header[_SEQ])
+
+    def publish(self, values, timestamp: float | None = None) -> int:
+        if isinstance(values, dict):
+            values = [values[field] for field in self.fields]
+
+        seq = int(self._header[_SEQ])
+        slot = seq % self.capacity
+
+        self._slot_seq[slot] = 0  # 쓰는 중 표시
+        self._data[slot, 0] = time.time() if timestamp is None else timestamp
+        self._data[slot, 1:] = values
+        self._slot_seq[slot] = seq + 1
+        self._header[_SEQ] = seq + 1
+
+        return seq + 1
+
+    def latest(self) -> tuple[int, NDArray] | None:
+        """(순번, [타임스탬프, 센서 값...]) 복사본. 아직 값이 없으면 None
+
+        쓰는 프로세스가 기록 도중에 죽어서 슬롯이 끝내 완성되지 않으면, 정해진
+        횟수만 다시 읽고 마지막으로 읽은 값(없으면 None)을 반환한다.
+        """
+        for _ in range(_MAX_READ_RETRIES):
+            seq = int(self._header[_SEQ])
+            if seq == 0:
+                return None
+
+            slot = (seq - 1) % self.capacity
+            row = self._data[slot].copy()
+            if self._slot_seq[slot] == seq:
+                self._last = (seq, row)
+                return self._last
+
+        return self._last
+
+    def view(self) -> NDArray:
+        """링 버퍼 전체에 대한 복사 없는 뷰 (슬롯 = 순번 % 용량)"""
+        return self._data
+
+    def read_since(self, seq: int) -> tuple[int, NDArray]:
+        """seq 이후에 기록된 값을 오래된 순서로 반환. 덮어써진 값은 건너뛴다"""
+        end = int(self._header[_SEQ])
+        start = max(seq, end - self.capacity)
+        if start >= end:
+            return end, np.empty((0, self._data.shape[1]))
+
+        seqs = np.arange(start, end)
+        rows = self._data[seqs % self.capacity]
+        # 복사하는 동안 덮어써진 슬롯은 제외
+        valid = self._slot_seq[seqs % self.capacity] == seqs + 1
+
+        return end, rows[valid]
+
+    def as_dict(self, row: NDArray) -> dict:
+        return dict(zip(self.fields, row[1:].tolist()))
+
+    def close(self):
+        self._header = self._slot_seq = self._data = None
+        self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
+
+    def __enter__(self) -> 'SensorBus':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BusSensor:
+    """SensorBus의 최신 값을 DummySensor와 같은 get_env 인터페이스로 제공"""
+
+    def __init__(self, bus_name: str) -> None:
+        self.bus = SensorBus.attach(bus_name)
+        self._env_values = dict.fromkeys(self.bus.fields, 0.0)
+
+    def get_env(self) -> dict:
+        latest = self.bus.latest()
+        if latest is not None:
+            self._env_values = self.bus.as_dict(latest[1])
+        return self._env_values
+
+
+def _run_writer(bus_name: str, count: int, interval: float):
+    with SensorBus.attach(bus_name) as bus:
+        computer = MissionComputer(DummySensor(), name='Writer', sensor_bus=bus)
+        for _ in range(count):
+            computer.report_sensor_data()
+            time.sleep(interval)
+
+
+def _run_reader(bus_name: str, reader_name: str, count: int, interval: float):
+    computer = MissionComputer(BusSensor(bus_name), name=reader_name)
+    for _ in range(count):
+        time.sleep(interval)
+        computer.report_sensor_data()
+
+
+def main():
+    count, interval = 3, 1.0
+
+    bus = SensorBus()
+    processes = [
+        multiprocessing.Process(target=_run_writer, args=(bus.name, count, interval))
+    ] + [
+        multiprocessing.Process(
+            target=_run_reader, args=(bus.name, f'Reader{i:02d}', count, interval)
+        )
+        for i in range(1, 3)
+    ]
+
+    try:
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        print('Keyboard Interrupt detected.')
+    finally:
+        bus.close()
+        bus.unlink()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+import queue
+import sqlite3
+import threading
+import time
+
+import numpy as np
+from mars_mission_computer import SENSOR_KEYS, DummySensor, MissionComputer
+from numpy.typing import NDArray
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS sensors ('
+    ' id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)',
+    'CREATE TABLE IF NOT EXISTS readings ('
+    ' timestamp REAL NOT NULL, sensor INTEGER NOT NULL, value REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS idx_readings_time_sensor'
+    ' ON readings (timestamp, sensor)',
+)
+INSERT_SQL = 'INSERT INTO readings (timestamp, sensor, value) VALUES (?, ?, ?)'
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute('PRAGMA journal_mode=WAL')
+    # WAL에서는 NORMAL이어도 전원이 나가지 않는 한 커밋이 보존된다
+    connection.execute('PRAGMA synchronous=NORMAL')
+    return connection
+
+
+class SQLiteStore:
+    """표준 라이브러리 sqlite3로 센서 값을 저장하고 조회하는 저장소
+
+    append는 행을 큐에 넣고 바로 돌아오며, 전용 쓰기 스레드가 batch_size행이
+    모이거나 flush_interval초가 지나면 트랜잭션 하나에 executemany로 기록한다.
+    WAL 모드라서 기록하는 동안에도 다른 연결로 조회할 수 있다. 센서 이름은
+    sensors 테이블의 정수 id로 저장한다. 대기열이 max_pending개로 가득 차면 append는
+    측정이 멈추지 않도록 새 행을 버리고 dropped에 세며, 대량 적재용 extend는 기본적으로
+    자리가 날 때까지 기다린다.
+    """
+
+    def __init__(
+        self,
+        path: str = 'sensor_history.db',
+        keys: tuple[str, ...] = SENSOR_KEYS,
+        batch_size: int = 5000,
+        flush_interval: float = 0.5,
+        max_pending: int = 100_000,
+    ) -> None:
+        self.path = path
+        self.keys = keys
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._read = _connect(path)
+        with self._read:
+            for statement in SCHEMA:
+                self._read.execute(statement)
+            self._read.executemany(
+                'INSERT OR IGNORE INTO sensors (name) VALUES (?)',
+                [(key,) for key in keys],
+            )
+        self.sensor_ids = dict(self._read.execute('SELECT name, id FROM sensors'))
+        self._codes = np.array([self.sensor_ids[key] for key in keys], dtype='i8')
+        self._read_lock = threading.Lock()
+
+        self._pending: queue.Queue = queue.Queue(max_pending)
+        self.rows_written = 0
+        self.batches_written = 0
+        self.write_time = 0.0
+        self.errors = 0
+        self.dropped = 0  # 대기열이 가득 차서 버린 행 수
+
+        self._writer = threading.Thread(target=self._run_writer, name='sqlite-writer')
+        self._writer.daemon = True
+        self._writer.start()
+
+    # 쓰기
+    def append(self, values, timestamp: float | None = None):
+        """센서 값 하나를 기록 대기열에 넣는다 (TimeSeriesStore.append와 같은 형식)"""
+        if isinstance(values, dict):
+            values = [values[key] for key in self.keys]
+        timestamp = time.time() if timestamp is None else timestamp
+
+        self._offer(
+            [
+                (timestamp, int(code), float(value))
+                for code, value in zip(self._codes, values)
+            ]
+        )
+
+    def extend(self, timestamps: NDArray, values: NDArray, block: bool = True):
+        """(n,) 시각과 (n, 센서 수) 값을 한 번에 기록 대기열에 넣는다
+
+        block이 거짓이면 append처럼 대기열이 가득 찼을 때 행을 버린다.
+        """
+        n = len(timestamps)
+        rows = list(
+            zip(
+                np.repeat(timestamps, len(self.keys)).tolist(),
+                np.tile(self._codes, n).tolist(),
+                np.asarray(values, dtype='f8').ravel().tolist(),
+            )
+        )
+        # 쓰기 스레드가 한 번에 가져가는 크기로 나눠 넣는다
+        for start in range(0, len(rows), self.batch_size):
+            self._offer(rows[start : start + self.batch_size], block)
+
+    def _offer(self, rows: list, block: bool = False):
+        if block:
+            self._pending.put(rows)
+            return
+        try:
+            self._pending.put_nowait(rows)
+        except queue.Full:
+            self.dropped += len(rows)
+
+    def _write(self, connection: sqlite3.Connection, rows: list):
+        start = time.perf_counter()
+        try:
+            with connection:
+                connection.executemany(INSERT_SQL, rows)
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f'[SQLiteStore] 기록 오류: {e}')
+            return
+
+        self.write_time += time.perf_counter() - start
+        self.rows_written += len(rows)
+        self.batches_written += 1
+
+    def _take(self) -> tuple[list, int, bool]:
+        """batch_size행이 모이거나 flush_interval이 지날 때까지 모은다
+
+        (행 목록, 꺼낸 항목 수, 계속 실행할지 여부)를 반환한다.
+        """
+        rows: list = []
+        taken = 0
+        deadline = time.monotonic() + self.flush_interval
+        while len(rows) < self.batch_size:
+            try:
+                item = self._pending.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+
+            taken += 1
+            if item is None:
+                return rows, taken, False
+            rows.extend(item)
+        return rows, taken, True
+
+    def _run_writer(self):
+        connection = _connect(self.path)
+        try:
+            running = True
+            while running:
+                rows, taken, running = self._take()
+                if rows:
+                    self._write(connection, rows)
+                # 기록을 마친 뒤에 완료 처리해야 flush가 기록 완료를 보장한다
+                for _ in range(taken):
+                    self._pending.task_done()
+        finally:
+            connection.close()
+
+    def flush(self):
+        """지금까지 append한 값이 모두 기록될 때까지 기다린다"""
+        self._pending.join()
+
+    def close(self):
+        self._pending.put(None)
+        self._writer.join()
+        self._read.close()
+
+    def __enter__(self) -> 'SQLiteStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def attach(self, computer: MissionComputer):
+        """MissionComputer가 측정한 센서 값을 기록한다"""
+
+        def on_report(kind: str, values: dict):
+            if kind == 'sensor':
+                self.append(values, computer.last_sensor_time)
+
+        computer.add_listener(on_report)
+
+    # 조회
+    def _fetch(self, sql: str, params: tuple) -> list:
+        with self._read_lock:
+            return self._read.execute(sql, params).fetchall()
+
+    def count(self) -> int:
+        return self._fetch('SELECT COUNT(*) FROM readings', ())[0][0]
+
+    def query(self, key: str, start: float, end: float) -> tuple[NDArray, NDArray]:
+        """[start, end) 범위의 한 센서 값을 (timestamps, values) 배열로 반환"""
+        rows = self._fetch(
+            'SELECT timestamp, value FROM readings'
+            ' WHERE timestamp >= ? AND timestamp < ? AND sensor = ?'
+            ' ORDER BY timestamp',
+            (start, end, self.sensor_ids[key]),
+        )
+        if not rows:
+            return np.empty(0), np.empty(0)
+        data = np.array(rows, dtype='f8')
+        return data[:, 0], data[:, 1]
+
+    def aggregate(
+        self,
+        start: float,
+        end: float,
+        keys=None,
+        step: float | None = None,
+    ) -> list[dict]:
+        """[start, end) 범위의 센서별 개수, 최솟값, 최댓값, 평균
+
+        step을 주면 시작 시각 기준 step초 구간별로 나눠서 계산한다.
+        """
+        keys = self.keys if keys is None else keys
+        ids = [self.sensor_ids[key] for key in keys]
+        names = {self.sensor_ids[key]: key for key in keys}
+        bucket = 'CAST((timestamp - ?) / ? AS INTEGER)' if step else '0'
+        placeholders = ','.join('?' * len(ids))
+
+        rows = self._fetch(
+            f'SELECT {bucket} AS bucket, sensor,'
+            ' COUNT(*), MIN(value), MAX(value), AVG(value) FROM readings'
+            ' WHERE timestamp >= ? AND timestamp < ?'
+            f' AND sensor IN ({placeholders})'
+            ' GROUP BY bucket, sensor ORDER BY bucket, sensor',
+            ((start, step) if step else ()) + (start, end, *ids),
+        )
+        return [
+            {
+                'start': start + bucket * step if step else start,
+                'key': names[sensor],
+                'count': count,
+                'min': low,
+                'max': high,
+                'mean': mean,
+            }
+            for bucket, sensor, count, low, high, mean in rows
+        ]
+
+    def latest(self) -> dict:
+        """센서별 가장 최근 (시각, 값)"""
+        rows = self._fetch(
+            'SELECT timestamp, sensor, value FROM readings'
+            ' WHERE timestamp = (SELECT MAX(timestamp) FROM readings)',
+            (),
+        )
+        names = {code: key for key, code in self.sensor_ids.items()}
+        return {names[sensor]: (timestamp, value) for timestamp, sensor, value in rows}
+
+    def stats(self) -> dict:
+        return {
+            'rows_written': self.rows_written,
+            'batches_written': self.batches_written,
+            'rows_per_second': (
+                self.rows_written / self.write_time if self.write_time else 0.0
+            ),
+            'pending': self._pending.qsize(),
+            'errors': self.errors,
+            'dropped': self.dropped,
+        }
+
+
+def main():
+    computer = MissionComputer(DummySensor(), name='SQLite', echo=False)
+    computer.SENSOR_INTERVAL = 0.1
+
+    with SQLiteStore('sensor_history.db', flush_interval=0.2) as store:
+        store.attach(computer)
+        computer.run_scheduler(duration=3)
+        store.flush()
+
+        now = time.time()
+        print('########## SQLite 센서 기록 ##########')
+        print(f'저장된 행: {store.count():,}')
+        for row in store.aggregate(now - 60, now):
+            print(
+                f'{row["key"]}: {row["count"]}개, 평균 {row["mean"]:.3f}, '
+                f'최소 {row["min"]:.3f}, 최대 {row["max"]:.3f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
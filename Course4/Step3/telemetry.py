@@ -0,0 +1,381 @@
+import bisect
+import itertools
+import json
+import mmap
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+from mars_mission_computer import SENSOR_KEYS
+from numpy.lib.recfunctions import structured_to_unstructured
+from numpy.typing import NDArray
+
+# 파일 헤더: 매직, 버전, 프레임 크기
+FILE_MAGIC = b'MTEL'
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct('<4sHH8x')
+
+# 프레임: 종류(1바이트) + 패딩 + 타임스탬프 + 값 6개 = 64바이트 고정
+KIND_SENSOR = 1
+KIND_LOAD = 2
+SENSOR_FRAME = struct.Struct('<B7xd6d')
+LOAD_FRAME = struct.Struct('<B7xdddQQQQ')
+FRAME_SIZE = SENSOR_FRAME.size
+
+LOAD_KEYS = (
+    'cpu_percent',
+    'process_cpu_percent',
+    'process_rss',
+    'memory_available',
+    'process_read_bytes',
+    'process_write_bytes',
+)
+
+# mmap으로 읽을 때 사용하는 NumPy 레이아웃 (값은 종류에 따라 해석)
+FRAME_DTYPE = np.dtype(
+    [('kind', 'u1'), ('_pad', 'V7'), ('timestamp', 'f8'), ('values', 'V48')]
+)
+SENSOR_VALUES_DTYPE = np.dtype([(key, 'f8') for key in SENSOR_KEYS])
+SENSOR_FRAME_DTYPE = np.dtype(
+    [('kind', 'u1'), ('_pad', 'V7'), ('timestamp', 'f8')]
+    + [(key, 'f8') for key in SENSOR_KEYS]
+)
+LOAD_VALUES_DTYPE = np.dtype(
+    [(key, 'f8') for key in LOAD_KEYS[:2]] + [(key, 'u8') for key in LOAD_KEYS[2:]]
+)
+
+
+def encode_sensor(values: dict, timestamp: float) -> bytes:
+    return SENSOR_FRAME.pack(
+        KIND_SENSOR, timestamp, *(values[key] for key in SENSOR_KEYS)
+    )
+
+
+def encode_load(sample: dict, timestamp: float) -> bytes:
+    return LOAD_FRAME.pack(
+        KIND_LOAD,
+        timestamp,
+        sample.get('cpu_percent', 0.0),
+        sample.get('process_cpu_percent', 0.0),
+        *(int(sample.get(key, 0)) for key in LOAD_KEYS[2:]),
+    )
+
+
+class TelemetryWriter:
+    """센서/부하 값을 배치로 모아 교체(rotate)되는 추가 전용 파일에 기록한다
+
+    binary 형식은 64바이트 고정 struct 프레임이고, ndjson 형식은 한 줄에 JSON
+    하나를 쓴다. 다음 레코드를 쓰면 파일 크기가 max_bytes를 넘거나 max_age초가
+    지나면 새 파일을 연다. 버퍼는 batch_size개가 모이거나 마지막 flush 후
+    flush_interval초가 지나면 기록된다.
+    """
+
+    def __init__(
+        self,
+        directory,
+        prefix: str = 'telemetry',
+        fmt: str = 'binary',
+        max_bytes: int = 64 * 2**20,
+        max_age: float = 3600.0,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+    ) -> None:
+        if fmt not in ('binary', 'ndjson'):
+            raise ValueError(f'지원하지 않는 형식입니다: {fmt}')
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.fmt = fmt
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._buffer: list[bytes] = []
+        self._file = None
+        self._file_bytes = 0
+        self._header_bytes = 0
+        self._opened_at = 0.0
+        self._flushed_at = time.monotonic()
+        self._sequence = 0
+        self.path: Path | None = None
+
+    def _open_next(self):
+        self.close_file()
+
+        suffix = 'bin' if self.fmt == 'binary' else 'ndjson'
+        stamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+        self._sequence += 1
+        self.path = (
+            self.directory / f'{self.prefix}-{stamp}-{self._sequence:04d}.{suffix}'
+        )
+
+        self._file = open(self.path, 'ab')
+        self._file_bytes = self._file.tell()
+        self._opened_at = time.monotonic()
+
+        if self.fmt == 'binary' and self._file_bytes == 0:
+            header = FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, FRAME_SIZE)
+            self._file.write(header)
+            self._file_bytes = len(header)
+        self._header_bytes = self._file_bytes
+
+    def _room(self, needed: int) -> int:
+        """needed바이트를 쓸 파일을 준비하고 그 파일에 쓸 수 있는 바이트 수를 반환
+
+        빈 파일보다 큰 레코드도 기록되도록 needed 이상을 반환한다.
+        """
+        if (
+            self._file is None
+            or time.monotonic() - self._opened_at >= self.max_age
+            or (
+                self._file_bytes + needed > self.max_bytes
+                and self._file_bytes > self._header_bytes
+            )
+        ):
+            self._open_next()
+        return max(self.max_bytes - self._file_bytes, needed)
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._file_bytes += len(data)
+
+    def _append(self, record: bytes):
+        self._buffer.append(record)
+        if (
+            len(self._buffer) >= self.batch_size
+            or time.monotonic() - self._flushed_at >= self.flush_interval
+        ):
+            self.flush()
+
+    def write_sensor(self, values: dict, timestamp: float | None = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        if self.fmt == 'binary':
+            self._append(encode_sensor(values, timestamp))
+        else:
+            record = {'kind': 'sensor', 'timestamp': timestamp, **values}
+            self._append(json.dumps(record, separators=(',', ':')).encode() + b'\n')
+
+    def write_sensor_batch(self, readings: NDArray):
+        """DummySensor.generate_batch 형식의 구조화 배열을 한 번에 기록한다"""
+        if self.fmt != 'binary':
+            for reading in readings:
+                values = {key: float(reading[key]) for key in SENSOR_KEYS}
+                self.write_sensor(values, float(reading['timestamp']))
+            return
+
+        frames = np.zeros(len(readings), dtype=SENSOR_FRAME_DTYPE)
+        frames['kind'] = KIND_SENSOR
+        frames['timestamp'] = readings['timestamp']
+        for key in SENSOR_KEYS:
+            frames[key] = readings[key]
+
+        self.flush()
+        # 파일 경계에서 나눠 써서 max_bytes를 지킨다
+        start = 0
+        while start < len(frames):
+            count = self._room(FRAME_SIZE) // FRAME_SIZE
+            self._write(frames[start : start + count].tobytes())
+            start += count
+        self._file.flush()
+        self._flushed_at = time.monotonic()
+
+    def write_load(self, sample: dict, timestamp: float | None = None):
+        timestamp = (
+            sample.get('timestamp', time.time()) if timestamp is None else timestamp
+        )
+        if self.fmt == 'binary':
+            self._append(encode_load(sample, timestamp))
+        else:
+            record = {'kind': 'load', 'timestamp': timestamp}
+            record.update((key, sample[key]) for key in LOAD_KEYS if key in sample)
+            self._append(json.dumps(record, separators=(',', ':')).encode() + b'\n')
+
+    def flush(self):
+        self._flushed_at = time.monotonic()
+        if not self._buffer:
+            return
+
+        records, self._buffer = self._buffer, []
+        ends = list(itertools.accumulate(map(len, records)))
+        start = written = 0
+        while start < len(records):
+            # 현재 파일에 들어가는 만큼만 한 번에 쓰고 나머지는 새 파일로 넘긴다
+            room = self._room(len(records[start]))
+            end = bisect.bisect_right(ends, written + room, lo=start)
+            self._write(b''.join(records[start:end]))
+            written = ends[end - 1]
+            start = end
+        self._file.flush()
+
+    def close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        self.flush()
+        self.close_file()
+
+    def __enter__(self) -> 'TelemetryWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_frames(path) -> NDArray:
+    """binary 텔레메트리 파일을 mmap해서 프레임 배열로 반환 (복사 없음)
+
+    반환된 배열은 파일 매핑을 참조하므로 사용하는 동안 매핑이 유지된다.
+    종류별 값은 sensor_values / load_values로 해석한다.
+    """
+    with open(path, 'rb') as f:
+        if Path(path).stat().st_size <= FILE_HEADER.size:
+            return np.empty(0, dtype=FRAME_DTYPE)
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, frame_size = FILE_HEADER.unpack_from(mapped)
+    if magic != FILE_MAGIC or frame_size != FRAME_SIZE:
+        raise ValueError(f'텔레메트리 파일 형식이 아닙니다: {path}')
+
+    count = (len(mapped) - FILE_HEADER.size) // FRAME_SIZE
+    return np.frombuffer(
+        mapped, dtype=FRAME_DTYPE, count=count, offset=FILE_HEADER.size
+    )
+
+
+def sensor_values(frames: NDArray) -> tuple[NDArray, NDArray]:
+    """센서 프레임만 골라 (timestamps, 센서 값 구조화 배열)로 반환"""
+    selected = frames[frames['kind'] == KIND_SENSOR]
+    return selected['timestamp'], selected['values'].view(SENSOR_VALUES_DTYPE)
+
+
+def load_values(frames: NDArray) -> tuple[NDArray, NDArray]:
+    """부하 프레임만 골라 (timestamps, 부하 값 구조화 배열)로 반환"""
+    selected = frames[frames['kind'] == KIND_LOAD]
+    return selected['timestamp'], selected['values'].view(LOAD_VALUES_DTYPE)
+
+
+def iter_frames(path) -> Iterator[tuple[str, float, dict]]:
+    """(종류, 타임스탬프, 값 dict)를 차례로 돌려준다. binary/ndjson 모두 지원"""
+    if str(path).endswith('.ndjson'):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                yield record.pop('kind'), record.pop('timestamp'), record
+        return
+
+    frames = read_frames(path)
+    for kind, timestamp, values in zip(
+        frames['kind'].tolist(),
+        frames['timestamp'].tolist(),
+        frames['values'].tolist(),
+    ):
+        if kind == KIND_SENSOR:
+            yield (
+                'sensor',
+                timestamp,
+                dict(zip(SENSOR_KEYS, struct.unpack('<6d', values))),
+            )
+        elif kind == KIND_LOAD:
+            yield (
+                'load',
+                timestamp,
+                dict(zip(LOAD_KEYS, struct.unpack('<ddQQQQ', values))),
+            )
+
+
+def load_recording(paths) -> tuple[NDArray, NDArray]:
+    """텔레메트리 파일들의 센서 값을 (timestamps, (n, 센서 수) 배열)로 합친다"""
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+
+    timestamps, values = [], []
+    for path in paths:
+        if str(path).endswith('.ndjson'):
+            records = [
+                (timestamp, [record[key] for key in SENSOR_KEYS])
+                for kind, timestamp, record in iter_frames(path)
+                if kind == 'sensor'
+            ]
+            timestamps.append(np.array([r[0] for r in records], dtype='f8'))
+            values.append(
+                np.array([r[1] for r in records], dtype='f8').reshape(
+                    -1, len(SENSOR_KEYS)
+                )
+            )
+        else:
+            frame_timestamps, frame_values = sensor_values(read_frames(path))
+            timestamps.append(np.array(frame_timestamps))
+            values.append(structured_to_unstructured(frame_values, dtype='f8'))
+
+    if not timestamps:
+        return np.empty(0), np.empty((0, len(SENSOR_KEYS)))
+
+    timestamps = np.concatenate(timestamps)
+    values = np.concatenate(values)
+    order = np.argsort(timestamps, kind='stable')
+
+    return timestamps[order], values[order]
+
+
+class ReplaySensor:
+    """기록된 텔레메트리를 DummySensor와 같은 get_env 인터페이스로 재생한다
+
+    재생 시계는 첫 get_env 호출부터 흐르며, speed배 빠르게 진행된다. get_env는
+    재생 시계 기준으로 가장 최근에 기록된 값을 돌려주므로 호출 주기와 상관없이
+    기록된 시간 흐름을 따른다. loop=True면 끝에 도달했을 때 처음부터 반복한다.
+    """
+
+    def __init__(self, paths, speed: float = 1.0, loop: bool = False) -> None:
+        if speed <= 0:
+            raise ValueError('재생 속도는 0보다 커야 합니다.')
+
+        self.timestamps, self.values = load_recording(paths)
+        if len(self.timestamps) == 0:
+            raise ValueError('재생할 센서 기록이 없습니다.')
+
+        self.speed = speed
+        self.loop = loop
+        self._offsets = self.timestamps - self.timestamps[0]
+        self._duration = self._offsets[-1]
+        self._started: float | None = None
+        self._env_values = dict.fromkeys(SENSOR_KEYS, 0.0)
+
+    def _position(self) -> int:
+        if self._started is None:
+            self._started = time.monotonic()
+
+        elapsed = (time.monotonic() - self._started) * self.speed
+        if self.loop and self._duration > 0:
+            elapsed %= self._duration
+
+        return int(np.searchsorted(self._offsets, elapsed, side='right')) - 1
+
+    @property
+    def done(self) -> bool:
+        if self._started is None or self.loop:
+            return False
+        elapsed = (time.monotonic() - self._started) * self.speed
+        return elapsed >= self._duration
+
+    def get_env(self) -> dict:
+        position = max(self._position(), 0)
+        self._env_values = dict(zip(SENSOR_KEYS, self.values[position].tolist()))
+        return self._env_values
+
+    def replay(self) -> Iterator[tuple[float, dict]]:
+        """기록된 값을 하나씩 원래 간격 / speed만큼 기다리며 돌려준다"""
+        start = time.monotonic()
+        for offset, timestamp, values in zip(
+            self._offsets, self.timestamps, self.values
+        ):
+            delay = start + offset / self.speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            yield float(timestamp), dict(zip(SENSOR_KEYS, values.tolist()))
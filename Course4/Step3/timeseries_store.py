@@ -0,0 +1,113 @@
+import math
+import time
+
+import numpy as np
+from mars_mission_computer import SENSOR_KEYS
+from numpy.typing import NDArray
+
+
+class TimeSeriesStore:
+    """미리 할당한 NumPy 링 버퍼에 센서 값을 보관하는 메모리 시계열 저장소
+
+    values의 각 열이 센서 키 하나의 링 버퍼이고, 모든 열이 timestamps를 공유한다.
+    보관 기간(retention)과 샘플 간격으로 용량이 정해지며, 가득 차면 가장 오래된
+    값을 덮어쓰므로 메모리 사용량은 일정하다. 값은 시간 순서대로 들어온다고
+    가정한다.
+    """
+
+    def __init__(
+        self,
+        keys: tuple[str, ...] = SENSOR_KEYS,
+        retention: float = 3600.0,
+        sample_interval: float = 5.0,
+        capacity: int | None = None,
+    ) -> None:
+        self.keys = keys
+        self.retention = retention
+        self.capacity = capacity or math.ceil(retention / sample_interval) + 1
+
+        self._index = {key: i for i, key in enumerate(keys)}
+        self.timestamps = np.zeros(self.capacity, dtype='f8')
+        self.values = np.zeros((self.capacity, len(keys)), dtype='f8')
+        self._head = 0  # 다음에 쓸 위치
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, values, timestamp: float | None = None):
+        if isinstance(values, dict):
+            values = [values[key] for key in self.keys]
+
+        self.timestamps[self._head] = time.time() if timestamp is None else timestamp
+        self.values[self._head] = values
+
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def _segments(self) -> list[slice]:
+        """링 버퍼를 시간 순서의 연속 구간들로 나눈다"""
+        if self._size < self.capacity:
+            return [slice(0, self._size)]
+        return [slice(self._head, self.capacity), slice(0, self._head)]
+
+    def window(
+        self, seconds: float, now: float | None = None
+    ) -> tuple[NDArray, NDArray]:
+        """최근 seconds초(보관 기간 이내)의 (timestamps, values)를 시간 순서로 반환"""
+        if self._size == 0:
+            return np.empty(0), np.empty((0, len(self.keys)))
+
+        if now is None:
+            now = self.timestamps[(self._head - 1) % self.capacity]
+        start_time = now - min(seconds, self.retention)
+
+        parts = []
+        for segment in self._segments():
+            timestamps = self.timestamps[segment]
+            start = np.searchsorted(timestamps, start_time, side='left')
+            stop = np.searchsorted(timestamps, now, side='right')
+            if start < stop:
+                offset = segment.start
+                parts.append(slice(offset + start, offset + stop))
+
+        if not parts:
+            return np.empty(0), np.empty((0, len(self.keys)))
+        if len(parts) == 1:
+            return self.timestamps[parts[0]], self.values[parts[0]]
+
+        return (
+            np.concatenate([self.timestamps[part] for part in parts]),
+            np.concatenate([self.values[part] for part in parts]),
+        )
+
+    def stats(
+        self, seconds: float, keys=None, now: float | None = None
+    ) -> dict[str, dict]:
+        """최근 seconds초의 센서별 평균, 최솟값, 최댓값, 초당 변화율"""
+        timestamps, values = self.window(seconds, now)
+        keys = self.keys if keys is None else keys
+        columns = [self._index[key] for key in keys]
+
+        if len(timestamps) == 0:
+            return {key: {} for key in keys}
+
+        values = values[:, columns]
+        elapsed = timestamps[-1] - timestamps[0]
+        rates = (
+            (values[-1] - values[0]) / elapsed if elapsed > 0 else np.zeros(len(keys))
+        )
+        means = values.mean(axis=0)
+        mins = values.min(axis=0)
+        maxs = values.max(axis=0)
+
+        return {
+            key: {
+                'count': len(timestamps),
+                'mean': float(means[i]),
+                'min': float(mins[i]),
+                'max': float(maxs[i]),
+                'rate': float(rates[i]),
+            }
+            for i, key in enumerate(keys)
+        }
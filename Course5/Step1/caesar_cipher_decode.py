@@ -1,3 +1,64 @@
+import argparse
+import codecs
+import contextlib
+import json
+import math
+import mmap
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+
+UPPERCASES = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+LOWERCASES = 'abcdefghijklmnopqrstuvwxyz'
+SHIFTS = range(1, 27)
+
+# 영어 글자 빈도(%), a부터 z까지
+ENGLISH_FREQUENCIES = (
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966,
+    0.153, 0.772, 4.025, 2.406, 6.749, 7.507, 1.929, 0.095, 5.987,
+    6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+)  # fmt: skip
+
+# 사전 파일이 없을 때 쓰는 자주 나오는 영어 단어
+COMMON_WORDS = frozenset(
+    """
+    a about after all also am an and any are as at be because been but by can
+    come could day do even first for from get give go good have he her here him
+    his how i if in into is it its just know like look make man many me more my
+    new no not now of on one only or other our out over people say see she so
+    some take than that the their them then there these they think this time to
+    two up us use very want was way we well what when which who will with work
+    would year you your hello mars base oxygen password secret door open key love
+    help earth world life water emergency mission
+    """.split()
+)
+
+# 점수 계산에 쓰는 표본: 본문 곳곳에서 SAMPLE_WINDOWS개 구간을 합쳐 SAMPLE_SIZE자
+SAMPLE_SIZE = 4096
+SAMPLE_WINDOWS = 8
+# 후보 점수 = WORD_WEIGHT * 사전 단어 수 - CHI_WEIGHT * 글자 수 * 글자당 카이제곱
+# 두 항 모두 표본이 길수록 커지므로, 짧은 본문일수록 신뢰도가 낮게 나온다
+WORD_WEIGHT = 3.0
+CHI_WEIGHT = 0.05
+# 드문 글자 하나가 점수를 좌우하지 않도록 글자당 카이제곱의 상한을 둔다
+CHI_CAP = 10.0
+# main에서 이 신뢰도 이상이면 사람에게 묻지 않고 저장한다
+MIN_CONFIDENCE = 0.9
+
+_WORD_PATTERN = re.compile(r'[a-z]+')
+
+# 배치 모드: 이보다 큰 파일은 mmap으로 열고 표본만 읽는다
+MMAP_THRESHOLD = 1 << 20
+# --output-dir을 주면 해독문을 결과에 넣지 않고 이 접미사를 붙인 파일로 나눠서 쓴다
+DECODED_SUFFIX = '.decoded'
+DECODE_CHUNK_BYTES = 1 << 20
+PREVIEW_BYTES = 256
+
+
 def read_txt(file: str) -> str | None:
     try:
         with open(file, 'r', encoding='utf-8') as f:
@@ -8,30 +69,157 @@ def read_txt(file: str) -> str | None:
         print(e)
 
 
-def caesar_cipher_decode(target_text: str) -> list[str]:
+@lru_cache(maxsize=None)
+def _shift_table_bytes(shift: int) -> bytes:
+    """각 영문자를 shift만큼 앞으로 되돌리는 bytes.translate용 256바이트 변환표"""
+    shift %= 26
+    upper, lower = UPPERCASES.encode(), LOWERCASES.encode()
+    return bytes.maketrans(
+        upper + lower,
+        upper[-shift:] + upper[:-shift] + lower[-shift:] + lower[:-shift],
+    )
+
+
+def decode_shift(target_text: str, shift: int) -> str:
+    """영문자만 shift만큼 되돌리고 공백, 숫자, 기호 등은 그대로 둔다
+
+    str.translate는 ASCII가 아닌 글자가 하나라도 있으면 글자마다 dict를 찾는
+    느린 경로로 빠지므로, UTF-8 바이트에 bytes.translate를 적용한다.
+    """
+    return decode_shift_bytes(target_text.encode('utf-8'), shift).decode('utf-8')
+
+
+def decode_shift_bytes(data: bytes, shift: int) -> bytes:
+    """ASCII 바이트열 버전. UTF-8의 다른 바이트는 영문자와 겹치지 않아 그대로 남는다"""
+    return data.translate(_shift_table_bytes(shift))
+
+
+def caesar_cipher_decode(target_text: str, echo: bool = True) -> list[str]:
+    """1~26 모든 이동 값으로 되돌린 후보 목록 (result[i - 1]은 i만큼 되돌린 값)
+
+    입력은 한 번만 UTF-8로 인코딩하고, 각 후보는 bytes.translate 한 번으로
+    만들어진다.
+    """
     result = []
-    uppercases = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-    lowercases = 'abcdefghijklmnopqrstuvwxyz'
-
-    for i in range(1, 27):
-        decoded = []
-        ttu = uppercases[i:] + uppercases[:i]
-        ttl = lowercases[i:] + lowercases[:i]
-        for ch in target_text:
-            if ch == ' ':
-                decoded.append(' ')
-            elif ch.isupper():
-                decoded.append(uppercases[ttu.index(ch)])
-            else:
-                decoded.append(lowercases[ttl.index(ch)])
-        # decoded.append('\n')
-        decoded_txt = ''.join(decoded)
-        print(f'{i}) {decoded_txt}', end='\n')
+    data = target_text.encode('utf-8')
+
+    for i in SHIFTS:
+        decoded_txt = decode_shift_bytes(data, i).decode('utf-8')
+        if echo:
+            print(f'{i}) {decoded_txt}', end='\n')
         result.append(decoded_txt)
 
     return result
 
 
+@lru_cache(maxsize=None)
+def load_words(path: str | None = None) -> frozenset:
+    """사전 단어 집합을 한 번만 읽어 둔다. path가 없으면 COMMON_WORDS"""
+    if path is None:
+        return COMMON_WORDS
+
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return COMMON_WORDS | frozenset(line.strip().lower() for line in f)
+
+
+def sample_text(
+    target_text: str, size: int = SAMPLE_SIZE, windows: int = SAMPLE_WINDOWS
+) -> str:
+    """긴 본문에서 고르게 떨어진 구간들을 합쳐 최대 size자 표본을 만든다"""
+    if len(target_text) <= size:
+        return target_text
+
+    width = size // windows
+    step = (len(target_text) - width) // (windows - 1)
+    # 구간 경계에서 잘린 단어가 이어 붙지 않도록 공백으로 구분한다
+    # (bytes나 mmap을 넘기면 bytes 표본을 돌려준다)
+    separator = ' ' if isinstance(target_text, str) else b' '
+    return separator.join(
+        target_text[i * step : i * step + width] for i in range(windows)
+    )
+
+
+def chi_squared_scores(sample: str) -> dict[int, float]:
+    """이동 값별로 되돌린 글자 분포와 영어 빈도의 글자당 카이제곱 값
+
+    암호문 글자 수를 한 번만 센 뒤 이동 값만큼 돌려서 비교하므로 후보마다 다시
+    해독할 필요가 없다.
+    """
+    lowered = sample.lower()
+    counts = [lowered.count(ch) for ch in LOWERCASES]
+    total = sum(counts)
+    if total == 0:
+        return dict.fromkeys(SHIFTS, math.inf)
+
+    scores = {}
+    for shift in SHIFTS:
+        chi = 0.0
+        for k, frequency in enumerate(ENGLISH_FREQUENCIES):
+            expected = total * frequency / 100
+            observed = counts[(k + shift) % 26]
+            chi += (observed - expected) ** 2 / expected
+        scores[shift] = chi / total
+
+    return scores
+
+
+def _dictionary_hits(text: str, words: frozenset) -> tuple[int, int]:
+    """(사전에 있는 단어 수, 전체 영어 단어 수)"""
+    tokens = _WORD_PATTERN.findall(text.lower())
+    return sum(token in words for token in tokens), len(tokens)
+
+
+def dictionary_hit_rate(text: str, words: frozenset) -> float:
+    """text의 영어 단어 중 사전에 있는 단어의 비율"""
+    hits, total = _dictionary_hits(text, words)
+    return hits / total if total else 0.0
+
+
+def rank_shifts(
+    target_text: str,
+    words: frozenset | None = None,
+    sample_size: int = SAMPLE_SIZE,
+) -> list[dict]:
+    """모든 이동 값을 영어다운 정도로 채점해서 좋은 순서로 반환한다
+
+    본문 길이와 상관없이 최대 sample_size자 표본만 해독해서 채점한다.
+    confidence는 점수에 softmax를 적용한 후보 간 상대 확률이라서, 표본이 짧거나
+    영어 단어가 없으면 낮게 나온다.
+    """
+    words = load_words() if words is None else words
+    sample = sample_text(target_text, sample_size)
+    chi_scores = chi_squared_scores(sample)
+    letters = sum(map(sample.count, UPPERCASES + LOWERCASES))
+
+    candidates = []
+    for shift in SHIFTS:
+        hits, total = _dictionary_hits(decode_shift(sample, shift), words)
+        chi = chi_scores[shift]
+        candidates.append(
+            {
+                'shift': shift,
+                'score': WORD_WEIGHT * hits - CHI_WEIGHT * letters * min(chi, CHI_CAP),
+                'chi_squared': chi,
+                'hit_rate': hits / total if total else 0.0,
+            }
+        )
+
+    # 점수를 로그 가능도처럼 보고 softmax로 후보별 확률을 만든다
+    best = max(candidate['score'] for candidate in candidates)
+    weights = [math.exp(candidate['score'] - best) for candidate in candidates]
+    total_weight = sum(weights)
+    for candidate, weight in zip(candidates, weights):
+        candidate['confidence'] = weight / total_weight
+
+    return sorted(candidates, key=lambda candidate: candidate['score'], reverse=True)
+
+
+def best_shift(target_text: str, words: frozenset | None = None) -> tuple[int, float]:
+    """가장 그럴듯한 (이동 값, 신뢰도)"""
+    best = rank_shifts(target_text, words)[0]
+    return best['shift'], best['confidence']
+
+
 def save_password(txt: str, filename: str = 'Course5/Step1/result.txt'):
     try:
         with open(filename, 'w', encoding='utf-8') as f:
@@ -49,21 +237,228 @@ def save_passwords(data: list, filename: str = 'Course5/Step1/result.txt'):
         print(e)
 
 
-def main():
-    encoded_txt = read_txt('Course5/Step1/password.txt')
-    if encoded_txt is None:
+def _open_data(f, size: int):
+    """작은 파일은 bytes로 읽고, 큰 파일은 mmap으로 연다 (둘 다 with로 사용)"""
+    if size >= MMAP_THRESHOLD:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return contextlib.nullcontext(f.read())
+
+
+def _emit_text(chunks, text_path: Path | None) -> dict:
+    """해독한 바이트 청크를 UTF-8로 검증하면서 결과 필드로 만든다
+
+    text_path가 없으면 해독문 전체를 text에 넣고, 있으면 그 파일에 청크 단위로
+    쓴 뒤 경로와 앞부분 미리보기를 넣는다. 잘못된 UTF-8이면 UnicodeDecodeError를
+    일으키고 쓰던 파일은 지운다.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    if text_path is None:
+        text = ''.join(decoder.decode(chunk) for chunk in chunks)
+        return {'text': (text + decoder.decode(b'', final=True)).strip()}
+
+    text_path.parent.mkdir(parents=True, exist_ok=True)
+    preview = b''
+    try:
+        with open(text_path, 'wb') as out:
+            for chunk in chunks:
+                decoder.decode(chunk)
+                preview += chunk[: PREVIEW_BYTES - len(preview)]
+                out.write(chunk)
+            decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        text_path.unlink(missing_ok=True)
+        raise
+
+    return {
+        'text_path': str(text_path),
+        'preview': preview.decode('utf-8', errors='ignore'),
+    }
+
+
+def decode_file(
+    path: str, text_path: Path | None = None, words_path: str | None = None
+) -> dict:
+    """파일 하나를 자동으로 해독한 결과 (NDJSON 한 줄에 해당하는 dict)
+
+    큰 파일은 mmap으로 열어 표본만 채점하고, 해독은 크기와 상관없이
+    DECODE_CHUNK_BYTES씩 나눠서 한다. 바이트 단위 변환이라 청크 경계가 UTF-8
+    글자 중간이어도 결과가 같고, 잘못된 UTF-8은 파일 크기와 상관없이 오류로
+    기록된다. text_path가 있으면 해독문을 그 파일에 쓴다. 영문자가 없어
+    카이제곱을 계산할 수 없으면 chi_squared는 None이다.
+    """
+    record = {'path': path}
+    try:
+        words = load_words(words_path)
+        size = os.path.getsize(path)
+        record['bytes'] = size
+
+        with open(path, 'rb') as f, _open_data(f, size) as data:
+            if size >= MMAP_THRESHOLD:
+                sample = sample_text(data).decode('utf-8', errors='ignore')
+            else:
+                sample = data.decode('utf-8')
+            best = rank_shifts(sample, words)[0]
+
+            chunks = (
+                decode_shift_bytes(data[i : i + DECODE_CHUNK_BYTES], best['shift'])
+                for i in range(0, size, DECODE_CHUNK_BYTES)
+            )
+            text = _emit_text(chunks, text_path)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        record['error'] = str(e)
+        return record
+
+    record.update(
+        shift=best['shift'],
+        confidence=round(best['confidence'], 6),
+        hit_rate=round(best['hit_rate'], 6),
+        chi_squared=(
+            round(best['chi_squared'], 6)
+            if math.isfinite(best['chi_squared'])
+            else None
+        ),
+        **text,
+    )
+    return record
+
+
+def decode_directory(
+    source: str,
+    output,
+    pattern: str = '*.txt',
+    workers: int | None = None,
+    words_path: str | None = None,
+    chunksize: int = 16,
+    output_dir: str | None = None,
+) -> dict:
+    """source 아래의 pattern 파일을 프로세스 풀에서 해독해 output에 NDJSON으로 쓴다
+
+    결과는 파일 순서대로 나오는 즉시 한 줄씩 기록되므로 전체 결과를 메모리에
+    모으지 않는다. 사전은 워커 프로세스마다 한 번만 읽는다. output_dir을 주면
+    해독문은 source 안의 상대 경로 그대로 output_dir 아래 .decoded 파일로 쓰고,
+    입력 디렉터리에는 아무것도 쓰지 않는다. 이전 실행이 남긴 해독문 파일은 다시
+    해독하지 않는다.
+    """
+    files = sorted(
+        str(path)
+        for path in Path(source).rglob(pattern)
+        if path.is_file() and path.suffix != DECODED_SUFFIX
+    )
+    if output_dir is None:
+        text_paths = [None] * len(files)
+    else:
+        text_paths = [
+            Path(output_dir) / f'{Path(file).relative_to(source)}{DECODED_SUFFIX}'
+            for file in files
+        ]
+    start = time.perf_counter()
+    total_bytes = failed = 0
+
+    with ProcessPoolExecutor(workers) as executor:
+        decode = partial(decode_file, words_path=words_path)
+        for record in executor.map(decode, files, text_paths, chunksize=chunksize):
+            output.write(json.dumps(record, ensure_ascii=False, allow_nan=False) + '\n')
+            total_bytes += record.get('bytes', 0)
+            failed += 'error' in record
+
+    elapsed = time.perf_counter() - start
+    return {
+        'files': len(files),
+        'failed': failed,
+        'bytes': total_bytes,
+        'elapsed': elapsed,
+        'files_per_second': len(files) / elapsed if elapsed > 0 else 0.0,
+        'mb_per_second': total_bytes / 2**20 / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def _open_or_std(path: str, mode: str, std):
+    if path == '-':
+        return contextlib.nullcontext(std)
+    return open(path, mode, encoding='utf-8')
+
+
+def batch_main(args):
+    if not os.path.isdir(args.batch):
+        print(f'디렉터리가 존재하지 않습니다: {args.batch}', file=sys.stderr)
         return
-    result = caesar_cipher_decode(encoded_txt)
+
+    try:
+        with _open_or_std(args.output, 'w', sys.stdout) as output_file:
+            summary = decode_directory(
+                args.batch,
+                output_file,
+                args.pattern,
+                args.workers,
+                args.words,
+                output_dir=args.output_dir,
+            )
+    except PermissionError:
+        print('파일 접근 권한이 없습니다.', file=sys.stderr)
+        return
+
+    print(
+        f'파일 {summary["files"]:,}개 (실패 {summary["failed"]:,}개), '
+        f'{summary["elapsed"]:.2f}초, {summary["files_per_second"]:,.1f} files/s, '
+        f'{summary["mb_per_second"]:,.2f} MB/s',
+        file=sys.stderr,
+    )
+
+
+def _ask_choice(count: int) -> int:
     while True:
         try:
             choice = int(input('저장할 암호 번호를 입력하세요: '))
-            if choice < 1 or choice > len(result):
+            if choice < 1 or choice > count:
                 raise ValueError
-            break
+            return choice
         except ValueError:
             print('숫자를 다시 입력하세요.')
 
-    save_password(result[choice - 1])
+
+def main():
+    parser = argparse.ArgumentParser(description='카이사르 암호 해독')
+    parser.add_argument('--batch', metavar='DIR', help='암호문 파일이 있는 디렉터리')
+    parser.add_argument(
+        '--output', default='-', help='NDJSON 결과 경로 (기본값: stdout)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        default=None,
+        help='해독문을 NDJSON 대신 파일로 쓸 디렉터리 (기본값: NDJSON의 text)',
+    )
+    parser.add_argument('--pattern', default='*.txt', help='해독할 파일 이름 패턴')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수')
+    parser.add_argument('--words', default=None, help='추가 사전 단어 파일')
+    args = parser.parse_args()
+
+    if args.batch is not None:
+        batch_main(args)
+        return
+
+    encoded_txt = read_txt('Course5/Step1/password.txt')
+    if encoded_txt is None:
+        return
+
+    ranking = rank_shifts(encoded_txt)
+    print('########## 해독 후보 순위 ##########')
+    for candidate in ranking[:5]:
+        preview = decode_shift(encoded_txt[:60], candidate['shift'])
+        print(
+            f'{candidate["shift"]}) 신뢰도 {candidate["confidence"]:.3f}, '
+            f'사전 적중 {candidate["hit_rate"]:.0%}, '
+            f'카이제곱 {candidate["chi_squared"]:.3f}: {preview}'
+        )
+
+    best = ranking[0]
+    if best['confidence'] >= MIN_CONFIDENCE:
+        shift = best['shift']
+    else:
+        # 확신할 수 없으면 기존처럼 모든 후보를 보여 주고 직접 고르게 한다
+        caesar_cipher_decode(encoded_txt)
+        shift = _ask_choice(len(SHIFTS))
+
+    save_password(decode_shift(encoded_txt, shift))
 
 
 if __name__ == '__main__':